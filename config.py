@@ -12,6 +12,9 @@ PREVIEW_CELL_HEIGHT = PREVIEW_CELL_WIDTH * 9 // 16  # 90
 GRID_OUTPUT_WIDTH = 1920
 GRID_OUTPUT_HEIGHT = 1080
 
+# 缩放后图片的缓存数量（预览刷新与导出共享）
+IMAGE_DECODE_CACHE_SIZE = 32
+
 # 竖屏图片占据的格子数（纵向）
 VERTICAL_IMAGE_SPAN = 3
 
@@ -29,6 +32,8 @@ def calculate_spacing(cell_height: int) -> int:
 # 状态文件配置
 DATA_DIR = "data"
 STATE_FILE_EXTENSION = ".json"
+# 状态文件格式版本（1.1起网格布局通过序号引用已使用图片列表，1.2起只保存图片主格子）
+STATE_FILE_VERSION = "1.2"
 
 # 默认网格行列数
 DEFAULT_GRID_ROWS = 13
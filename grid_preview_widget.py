@@ -2,11 +2,28 @@
 """
 网格预览组件
 """
-from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, QRect, Signal
-from PySide6.QtGui import QPainter, QColor, QPen, QMouseEvent, QFont
+from bisect import bisect_right
 
-from models import PuzzleModel, ImageOrientation
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, QLine, QRect, Signal
+from PySide6.QtGui import (
+    QPainter,
+    QBrush,
+    QColor,
+    QPen,
+    QMouseEvent,
+    QFont,
+    QPixmap,
+    QStaticText,
+)
+
+from models import (
+    CELL_EMPTY,
+    CELL_HORIZONTAL,
+    CELL_VERTICAL_MAIN,
+    CELL_VERTICAL_SUB,
+    PuzzleModel,
+)
 
 from config import AREA_SELECT_MAIN_POSITION
 
@@ -16,7 +33,6 @@ from config import AREA_SELECT_MAIN_POSITION
 GRID_MIN_WIDTH = 400
 GRID_MIN_HEIGHT = 300
 GRID_BACKGROUND_COLOR = "white"
-GRID_BORDER_COLOR = "#ccc"
 
 # 颜色配置
 # 横屏图片颜色
@@ -30,10 +46,8 @@ VERTICAL_IMAGE_TEXT_COLOR = QColor(255, 255, 255)
 
 # 空闲格子颜色
 EMPTY_CELL_COLOR = QColor(255, 255, 255)
-OCCUPIED_FALLBACK_COLOR = QColor(200, 200, 200, 100)
 
 # 网格线颜色
-GRID_LINE_COLOR = QColor(200, 200, 200)
 GRID_LINE_WIDTH = 1
 GRID_OUTLINE_COLOR = QColor(150, 150, 150)
 
@@ -60,6 +74,32 @@ VERTICAL_IMAGE_MARKER = "V"
 
 # ==============================
 
+# 绘制用画笔，只创建一次，所有绘制共用
+_OUTLINE_PEN = QPen(GRID_OUTLINE_COLOR, GRID_LINE_WIDTH)
+_LABEL_PEN = QPen(ROW_COL_LABEL_COLOR, 1)
+_HORIZONTAL_TEXT_PEN = QPen(HORIZONTAL_IMAGE_TEXT_COLOR, 2)
+_VERTICAL_TEXT_PEN = QPen(VERTICAL_IMAGE_TEXT_COLOR, 2)
+_SELECTED_PEN = QPen(SELECTED_AREA_BORDER_COLOR, SELECTED_AREA_BORDER_WIDTH)
+_DRAG_SELECTION_PEN = QPen(DRAG_SELECTION_BORDER_COLOR, DRAG_SELECTION_BORDER_WIDTH)
+
+# 绘制用画刷，避免每次 setBrush(QColor) 都隐式构造 QBrush
+_BACKGROUND_BRUSH = QBrush(QColor(GRID_BACKGROUND_COLOR))
+_LABEL_BACKGROUND_BRUSH = QBrush(ROW_COL_LABEL_BACKGROUND)
+_SELECTED_BRUSH = QBrush(SELECTED_AREA_FILL_COLOR)
+_DRAG_SELECTION_BRUSH = QBrush(DRAG_SELECTION_FILL_COLOR)
+
+# "H"/"V"标记文本，字形布局在首次绘制后缓存复用
+_HORIZONTAL_MARKER_TEXT = QStaticText(HORIZONTAL_IMAGE_MARKER)
+_VERTICAL_MARKER_TEXT = QStaticText(VERTICAL_IMAGE_MARKER)
+
+# 格子状态对应的填充画刷
+_CELL_STATE_BRUSHES = (
+    (CELL_EMPTY, QBrush(EMPTY_CELL_COLOR)),
+    (CELL_HORIZONTAL, QBrush(HORIZONTAL_IMAGE_COLOR)),
+    (CELL_VERTICAL_MAIN, QBrush(VERTICAL_IMAGE_MAIN_COLOR)),
+    (CELL_VERTICAL_SUB, QBrush(VERTICAL_IMAGE_SUB_COLOR)),
+)
+
 
 class GridPreviewWidget(QWidget):
     """网格预览部件，用于显示整个网格和选中区域，带有行号列号标注和拖拽选择功能"""
@@ -71,6 +111,21 @@ class GridPreviewWidget(QWidget):
         super().__init__(parent)
         self.model = model
         self.selected_rect = QRect()  # 当前选中的区域
+        self.has_selection = False  # 是否有选中区域，避免反复调用 isNull()
+
+        # 网格内容渲染缓存（选中区域等覆盖层每次单独绘制）
+        self._grid_pixmap = None
+        self._grid_pixmap_key = None
+        # 缓存渲染时的模型版本号和格子状态，模型变化时只重绘状态变化的格子
+        self._grid_pixmap_version = None
+        self._grid_pixmap_states = None
+        # 行号列号和"H"/"V"标记使用的字体
+        self._font = QFont()
+        self._font.setPointSize(ROW_COL_FONT_SIZE)
+        # 格子边界的整数坐标表和各格子矩形，按 (部件尺寸, 行列数) 缓存
+        self._grid_edges = None
+        self._grid_edges_key = None
+        self._cell_rects = None
 
         # 拖拽选择相关状态
         self.is_dragging = False  # 是否正在拖拽选择
@@ -79,9 +134,8 @@ class GridPreviewWidget(QWidget):
         self.drag_current_row = -1  # 拖拽当前行
         self.drag_current_col = -1  # 拖拽当前列
 
-        self.setStyleSheet(
-            f"background-color: {GRID_BACKGROUND_COLOR}; border: 1px solid {GRID_BORDER_COLOR};"
-        )
+        # 网格缓存覆盖整个部件，无需 Qt 先绘制背景
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.setMinimumSize(
             GRID_MIN_WIDTH + ROW_COL_LABEL_WIDTH, GRID_MIN_HEIGHT + ROW_COL_LABEL_HEIGHT
         )  # 设置最小尺寸，考虑行号列号区域
@@ -98,23 +152,52 @@ class GridPreviewWidget(QWidget):
             self.height() - ROW_COL_LABEL_HEIGHT,
         )
 
+    def _get_edges(self):
+        """获取格子边界坐标表 (xs, ys)，第 i 列/行的范围为 [xs[i], xs[i+1])
+
+        边界取整数，相邻格子共用边界，绘制和点击判断都不再需要浮点乘除
+        """
+        rows = self.model.rows
+        cols = self.model.cols
+        key = (self.width(), self.height(), rows, cols)
+        if self._grid_edges_key != key:
+            grid_x, grid_y, grid_width, grid_height = self._get_grid_rect().getRect()
+            xs = [grid_x + i * grid_width // cols for i in range(cols + 1)]
+            ys = [grid_y + i * grid_height // rows for i in range(rows + 1)]
+            self._grid_edges = (xs, ys)
+            self._grid_edges_key = key
+            self._cell_rects = None
+        return self._grid_edges
+
+    def _get_cell_rects(self):
+        """获取各格子的屏幕矩形 rects[row][col]，随边界表一起缓存，绘制时直接复用"""
+        xs, ys = self._get_edges()
+        if self._cell_rects is None:
+            self._cell_rects = [
+                [
+                    QRect(left, top, right - left, bottom - top)
+                    for left, right in zip(xs, xs[1:])
+                ]
+                for top, bottom in zip(ys, ys[1:])
+            ]
+        return self._cell_rects
+
+    def _get_screen_rect(self, rect: QRect) -> QRect:
+        """将网格坐标的矩形区域转换为屏幕坐标（超出网格的部分截断）"""
+        xs, ys = self._get_edges()
+        col, row, cols, rows = rect.getRect()
+        left = xs[min(max(col, 0), len(xs) - 1)]
+        right = xs[min(max(col + cols, 0), len(xs) - 1)]
+        top = ys[min(max(row, 0), len(ys) - 1)]
+        bottom = ys[min(max(row + rows, 0), len(ys) - 1)]
+        return QRect(left, top, right - left, bottom - top)
+
     def _get_cell_from_position(self, x, y):
         """根据屏幕坐标获取对应的格子行列，返回(row, col)，如果超出范围返回(-1, -1)"""
-        grid_rect = self._get_grid_rect()
-
-        # 检查是否在网格区域内
-        if not grid_rect.contains(int(x), int(y)):
-            return -1, -1
-
-        # 计算相对于网格区域的坐标
-        relative_x = x - grid_rect.x()
-        relative_y = y - grid_rect.y()
-
-        cell_width = grid_rect.width() / self.model.cols
-        cell_height = grid_rect.height() / self.model.rows
-
-        col = int(relative_x / cell_width)
-        row = int(relative_y / cell_height)
+        xs, ys = self._get_edges()
+        # 在边界表中二分查找所在格子
+        col = bisect_right(xs, x) - 1
+        row = bisect_right(ys, y) - 1
 
         # 确保坐标在有效范围内
         if 0 <= row < self.model.rows and 0 <= col < self.model.cols:
@@ -136,26 +219,99 @@ class GridPreviewWidget(QWidget):
         # 返回QRect(left, top, width, height) = QRect(col, row, width, height)
         return QRect(min_col, min_row, max_col - min_col + 1, max_row - min_row + 1)
 
-    def paintEvent(self, event):
-        """绘制网格和选中区域"""
-        super().paintEvent(event)
-        painter = QPainter(self)
-
+    def _get_grid_pixmap(self):
+        """获取网格内容缓存
+
+        (行列数, 部件尺寸, 设备像素比) 变化时整体重新渲染；
+        只有模型版本号变化时在原缓存上重绘状态变化的格子
+        """
+        ratio = self.devicePixelRatioF()
+        key = (
+            self.model.rows,
+            self.model.cols,
+            self.width(),
+            self.height(),
+            ratio,
+        )
+        version = self.model.version
+        if self._grid_pixmap is None or self._grid_pixmap_key != key:
+            pixmap = QPixmap(self.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(_BACKGROUND_BRUSH.color())
+            painter = QPainter(pixmap)
+            try:
+                self._render_grid(painter)
+            finally:
+                painter.end()
+            self._grid_pixmap = pixmap
+            self._grid_pixmap_key = key
+        elif self._grid_pixmap_version != version:
+            self._render_changed_cells()
+        else:
+            return self._grid_pixmap
+        self._grid_pixmap_version = version
+        self._grid_pixmap_states = [bytes(states) for states in self.model.cell_states]
+        return self._grid_pixmap
+
+    def _render_changed_cells(self):
+        """在网格缓存上只重绘与上次渲染相比状态变化的格子"""
+        xs, ys = self._get_edges()
+        cell_rects = self._get_cell_rects()
+        grid_rect = self._get_grid_rect()
+        grid_right = grid_rect.right()
+        grid_bottom = grid_rect.bottom()
+        rects_by_state = {state: [] for state, _ in _CELL_STATE_BRUSHES}
+        lines = []
+        for row, (rendered, states) in enumerate(
+            zip(self._grid_pixmap_states, self.model.cell_states)
+        ):
+            if rendered == states:
+                continue
+            top = ys[row]
+            bottom = ys[row + 1]
+            line_bottom = min(bottom, grid_bottom)
+            row_rects = cell_rects[row]
+            for col, state in enumerate(states):
+                if rendered[col] == state:
+                    continue
+                left = xs[col]
+                right = xs[col + 1]
+                line_right = min(right, grid_right)
+                rects_by_state[state].append(row_rects[col])
+                # 格子四周的网格线
+                lines.append(QLine(left, top, line_right, top))
+                lines.append(QLine(left, bottom, line_right, bottom))
+                lines.append(QLine(left, top, left, line_bottom))
+                lines.append(QLine(right, top, right, line_bottom))
+        if not lines:
+            return
+
+        painter = QPainter(self._grid_pixmap)
+        try:
+            painter.setFont(self._font)
+            # 格子颜色带透明度，先用背景色擦除旧内容再绘制，与整体渲染结果一致
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(_BACKGROUND_BRUSH)
+            for rects in rects_by_state.values():
+                painter.drawRects(rects)
+            self._render_cells(painter, rects_by_state)
+            painter.setPen(_OUTLINE_PEN)
+            painter.drawLines(lines)
+        finally:
+            painter.end()
+
+    def _render_grid(self, painter: QPainter):
+        """绘制行号列号、格子和网格线（不含选中区域）"""
         # 设置字体
-        font = QFont()
-        font.setPointSize(ROW_COL_FONT_SIZE)
-        painter.setFont(font)
+        painter.setFont(self._font)
 
-        # 获取实际网格区域
+        # 获取实际网格区域和格子边界
         grid_rect = self._get_grid_rect()
-
-        # 计算每个单元格的大小
-        cell_width = grid_rect.width() / self.model.cols
-        cell_height = grid_rect.height() / self.model.rows
+        xs, ys = self._get_edges()
 
         # 绘制行号列号标注背景
-        painter.setBrush(ROW_COL_LABEL_BACKGROUND)
-        painter.setPen(QPen(GRID_OUTLINE_COLOR, GRID_LINE_WIDTH))
+        painter.setBrush(_LABEL_BACKGROUND_BRUSH)
+        painter.setPen(_OUTLINE_PEN)
 
         # 左上角空白区域
         painter.drawRect(0, 0, ROW_COL_LABEL_WIDTH, ROW_COL_LABEL_HEIGHT)
@@ -171,110 +327,106 @@ class GridPreviewWidget(QWidget):
         )
 
         # 绘制列号
-        painter.setPen(QPen(ROW_COL_LABEL_COLOR, 1))
+        painter.setPen(_LABEL_PEN)
+        y = ROW_COL_LABEL_HEIGHT // 2 + 3
         for col in range(self.model.cols):
-            x = ROW_COL_LABEL_WIDTH + col * cell_width + cell_width / 2 - 5
-            y = ROW_COL_LABEL_HEIGHT / 2 + 3
-            painter.drawText(int(x), int(y), str(col))
+            x = (xs[col] + xs[col + 1]) // 2 - 5
+            painter.drawText(x, y, str(col))
 
         # 绘制行号
+        x = ROW_COL_LABEL_WIDTH // 2 - 5
         for row in range(self.model.rows):
-            x = ROW_COL_LABEL_WIDTH / 2 - 5
-            y = ROW_COL_LABEL_HEIGHT + row * cell_height + cell_height / 2 + 3
-            painter.drawText(int(x), int(y), str(row))
+            y = (ys[row] + ys[row + 1]) // 2 + 3
+            painter.drawText(x, y, str(row))
 
         # 绘制网格背景（区分已占用和空闲的格子，以及横屏和竖屏图片）
-        for row in range(self.model.rows):
-            for col in range(self.model.cols):
-                cell = self.model.get_cell(row, col)
-                x = grid_rect.x() + col * cell_width
-                y = grid_rect.y() + row * cell_height
-
-                if cell and cell.is_occupied and cell.image:
-                    # 根据图片类型选择不同颜色
-                    if cell.image.orientation == ImageOrientation.VERTICAL:
-                        # 竖屏图片用蓝色系
-                        if cell.is_main_cell:
-                            painter.setBrush(VERTICAL_IMAGE_MAIN_COLOR)
-                            # 在主格子上绘制"V"标记
-                            painter.setPen(QPen(GRID_LINE_COLOR, GRID_LINE_WIDTH))
-                            painter.drawRect(x, y, cell_width, cell_height)
-                            painter.setPen(QPen(VERTICAL_IMAGE_TEXT_COLOR, 2))
-                            painter.drawText(
-                                int(x + cell_width // 2 - 5),
-                                int(y + cell_height // 2 + 5),
-                                VERTICAL_IMAGE_MARKER,
-                            )
-                        else:
-                            painter.setBrush(VERTICAL_IMAGE_SUB_COLOR)
-                            painter.setPen(QPen(GRID_LINE_COLOR, GRID_LINE_WIDTH))
-                            painter.drawRect(x, y, cell_width, cell_height)
-                    else:
-                        # 横屏图片用绿色系
-                        painter.setBrush(HORIZONTAL_IMAGE_COLOR)
-                        painter.setPen(QPen(GRID_LINE_COLOR, GRID_LINE_WIDTH))
-                        painter.drawRect(x, y, cell_width, cell_height)
-                        # 在横屏图片格子上绘制"H"标记
-                        painter.setPen(QPen(HORIZONTAL_IMAGE_TEXT_COLOR, 2))
-                        painter.drawText(
-                            int(x + cell_width // 2 - 5),
-                            int(y + cell_height // 2 + 5),
-                            HORIZONTAL_IMAGE_MARKER,
-                        )
-                elif cell and cell.is_occupied:
-                    # 占用但没有图片信息的格子（应该不会出现，但为了安全）
-                    painter.setBrush(OCCUPIED_FALLBACK_COLOR)
-                    painter.setPen(QPen(GRID_LINE_COLOR, GRID_LINE_WIDTH))
-                    painter.drawRect(x, y, cell_width, cell_height)
-                else:
-                    # 空闲格子用白色填充
-                    painter.setBrush(EMPTY_CELL_COLOR)
-                    painter.setPen(QPen(GRID_LINE_COLOR, GRID_LINE_WIDTH))
-                    painter.drawRect(x, y, cell_width, cell_height)
-
-        # 绘制网格线
-        painter.setBrush(QColor(0, 0, 0, 0))  # 透明填充
-        painter.setPen(QPen(GRID_OUTLINE_COLOR, GRID_LINE_WIDTH))
+        # 先按格子状态分组收集矩形，再每组设置一次画刷批量绘制
+        # 格子矩形按几何尺寸缓存，每次渲染只做分组，不再重新创建 QRect
+        rects_by_state = {state: [] for state, _ in _CELL_STATE_BRUSHES}
+        for states, row_rects in zip(self.model.cell_states, self._get_cell_rects()):
+            for state, rect in zip(states, row_rects):
+                rects_by_state[state].append(rect)
+
+        self._render_cells(painter, rects_by_state)
+
+        # 绘制网格线，一次提交所有线段
+        painter.setPen(_OUTLINE_PEN)
+        left = grid_rect.x()
+        right = grid_rect.right()
+        top = grid_rect.y()
+        bottom = grid_rect.bottom()
+        lines = [QLine(left, y, right, y) for y in ys]
+        lines.extend(QLine(x, top, x, bottom) for x in xs)
+        painter.drawLines(lines)
+
+    def _render_cells(self, painter: QPainter, rects_by_state):
+        """按格子状态批量绘制格子背景和"H"/"V"标记"""
+        # 只填充不描边，格子边框统一由随后绘制的网格线覆盖
+        painter.setPen(Qt.NoPen)
+        for state, brush in _CELL_STATE_BRUSHES:
+            rects = rects_by_state[state]
+            if rects:
+                painter.setBrush(brush)
+                painter.drawRects(rects)
+
+        # 在横屏图片格子和竖屏图片主格子上绘制"H"/"V"标记
+        # drawStaticText 以左上角定位，减去字体上升高度使基线与原先一致
+        ascent = painter.fontMetrics().ascent()
+        for state, pen, marker in (
+            (CELL_HORIZONTAL, _HORIZONTAL_TEXT_PEN, _HORIZONTAL_MARKER_TEXT),
+            (CELL_VERTICAL_MAIN, _VERTICAL_TEXT_PEN, _VERTICAL_MARKER_TEXT),
+        ):
+            rects = rects_by_state[state]
+            if not rects:
+                continue
+            painter.setPen(pen)
+            for rect in rects:
+                center = rect.center()
+                painter.drawStaticText(center.x() - 5, center.y() + 5 - ascent, marker)
+
+    def resizeEvent(self, event):
+        """尺寸变化时释放旧的网格缓存，下次绘制时按新尺寸重建"""
+        super().resizeEvent(event)
+        self._grid_pixmap = None
+        self._grid_pixmap_key = None
 
-        # 绘制水平网格线
-        for row in range(self.model.rows + 1):
-            y = grid_rect.y() + row * cell_height
-            painter.drawLine(grid_rect.x(), y, grid_rect.right(), y)
+    def paintEvent(self, event):
+        """绘制网格和选中区域"""
+        painter = QPainter(self)
 
-        # 绘制垂直网格线
-        for col in range(self.model.cols + 1):
-            x = grid_rect.x() + col * cell_width
-            painter.drawLine(x, grid_rect.y(), x, grid_rect.bottom())
+        # 网格内容只在模型或尺寸变化时重新渲染，其余情况直接绘制缓存
+        painter.drawPixmap(0, 0, self._get_grid_pixmap())
 
         # 绘制拖拽选择区域（如果正在拖拽）
         if self.is_dragging:
             drag_rect = self._get_drag_selection_rect()
             if not drag_rect.isNull():
-                painter.setPen(
-                    QPen(DRAG_SELECTION_BORDER_COLOR, DRAG_SELECTION_BORDER_WIDTH)
-                )
-                painter.setBrush(DRAG_SELECTION_FILL_COLOR)
-                x = grid_rect.x() + drag_rect.x() * cell_width
-                y = grid_rect.y() + drag_rect.y() * cell_height
-                width = drag_rect.width() * cell_width
-                height = drag_rect.height() * cell_height
-                painter.drawRect(x, y, width, height)
+                painter.setPen(_DRAG_SELECTION_PEN)
+                painter.setBrush(_DRAG_SELECTION_BRUSH)
+                painter.drawRect(self._get_screen_rect(drag_rect))
 
         # 绘制确定的选中区域（如果存在且不在拖拽中）
-        if not self.selected_rect.isNull() and not self.is_dragging:
-            painter.setPen(QPen(SELECTED_AREA_BORDER_COLOR, SELECTED_AREA_BORDER_WIDTH))
-            painter.setBrush(SELECTED_AREA_FILL_COLOR)
+        if self.has_selection and not self.is_dragging:
+            painter.setPen(_SELECTED_PEN)
+            painter.setBrush(_SELECTED_BRUSH)
             # QRect的x()对应col，y()对应row
-            x = grid_rect.x() + self.selected_rect.x() * cell_width
-            y = grid_rect.y() + self.selected_rect.y() * cell_height
-            width = self.selected_rect.width() * cell_width
-            height = self.selected_rect.height() * cell_height
-            painter.drawRect(x, y, width, height)
+            painter.drawRect(self._get_screen_rect(self.selected_rect))
 
     def set_selected_area(self, rect: QRect):
-        """设置选中区域并更新界面"""
-        self.selected_rect = rect
-        self.update()
+        """设置选中区域，只重绘新旧选中区域覆盖的部分"""
+        # 保存副本，避免调用方原地修改后丢失旧区域
+        old_rect = QRect(self.selected_rect)
+        dirty = QRect()
+        if self.has_selection:
+            dirty = self._get_screen_rect(old_rect)
+        self.selected_rect = QRect(rect)
+        self.has_selection = not rect.isNull()
+        if self.has_selection:
+            dirty = dirty.united(self._get_screen_rect(rect))
+        if not dirty.isNull():
+            # 向外扩展边框线宽，覆盖边框超出格子的部分
+            margin = SELECTED_AREA_BORDER_WIDTH
+            self.update(dirty.adjusted(-margin, -margin, margin, margin))
 
     def mousePressEvent(self, event: QMouseEvent):
         """鼠标按下事件，开始拖拽选择"""
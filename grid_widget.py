@@ -62,7 +62,7 @@ class GridCellWidget(QLabel):
         try:
             pixmap = QPixmap(str(image_info.path))
             if not pixmap.isNull():
-                if image_info.orientation == ImageOrientation.VERTICAL:
+                if image_info.orientation is ImageOrientation.VERTICAL:
                     if is_main_cell:
                         # 竖屏图片的主单元格，显示完整图片
                         # 计算竖屏图片应有的高度 (3个格子高度 + 2个间隔)
@@ -208,9 +208,7 @@ class GridWidget(QWidget):
 
     def _clear_grid(self):
         """清空网格"""
-        for row in range(self.model.rows):
-            for col in range(self.model.cols):
-                self.model.remove_image(row, col)
+        self.model.clear_region(0, 0, self.model.rows, self.model.cols)
         self.update_grid()
 
     def update_grid(self):
@@ -250,10 +248,18 @@ class GridWidget(QWidget):
         """单元格点击处理"""
         self.cell_clicked.emit(row, col)
 
-    def refresh_display(self):
-        """刷新显示"""
-        for row in range(self.model.rows):
-            for col in range(self.model.cols):
+    def refresh_display(self, region: Optional[tuple] = None):
+        """刷新显示
+
+        Args:
+            region: 只刷新的格子范围 (start_row, start_col, end_row, end_col)，
+                结束行列不包含在内；为None时刷新整个网格
+        """
+        if region is None:
+            region = (0, 0, self.model.rows, self.model.cols)
+        start_row, start_col, end_row, end_col = region
+        for row in range(max(start_row, 0), min(end_row, self.model.rows)):
+            for col in range(max(start_col, 0), min(end_col, self.model.cols)):
                 cell = self.model.get_cell(row, col)
                 if cell and len(self.cells) > row and len(self.cells[row]) > col:
                     cell_widget = self.cells[row][col]
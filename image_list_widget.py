@@ -18,13 +18,22 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QScrollArea,
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QSize, Signal
 from PySide6.QtGui import QPixmap, QIcon
 
 from models import PuzzleModel, ImageInfo, ImageOrientation
 import config
 
 
+def _scale_pixmap_to_fit(pixmap: QPixmap, max_width: int, max_height: int) -> QPixmap:
+    """按比例缩放图片以适应指定尺寸，原图已足够小时直接返回"""
+    if pixmap.width() <= max_width and pixmap.height() <= max_height:
+        return pixmap
+    return pixmap.scaled(
+        QSize(max_width, max_height), Qt.KeepAspectRatio, Qt.SmoothTransformation
+    )
+
+
 class ImageListItem(QListWidgetItem):
     """图片列表项"""
 
@@ -41,11 +50,8 @@ class ImageListItem(QListWidgetItem):
             if not pixmap.isNull():
                 # 创建缩略图
                 thumbnail_size = 64
-                scaled_pixmap = pixmap.scaled(
-                    thumbnail_size,
-                    thumbnail_size,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation,
+                scaled_pixmap = _scale_pixmap_to_fit(
+                    pixmap, thumbnail_size, thumbnail_size
                 )
                 self.setIcon(QIcon(scaled_pixmap))
         except Exception as e:
@@ -54,7 +60,7 @@ class ImageListItem(QListWidgetItem):
         # 设置文本
         orientation_text = (
             "横屏"
-            if self.image_info.orientation == ImageOrientation.HORIZONTAL
+            if self.image_info.orientation is ImageOrientation.HORIZONTAL
             else "竖屏"
         )
         text = f"{self.image_info.path.name}\n({orientation_text}, {self.image_info.width}x{self.image_info.height})"
@@ -231,12 +237,12 @@ class ImageListWidget(QWidget):
         if self.selected_image:
             orientation_text = (
                 "横屏"
-                if self.selected_image.orientation == ImageOrientation.HORIZONTAL
+                if self.selected_image.orientation is ImageOrientation.HORIZONTAL
                 else "竖屏"
             )
             span_text = (
                 "1个格子"
-                if self.selected_image.orientation == ImageOrientation.HORIZONTAL
+                if self.selected_image.orientation is ImageOrientation.HORIZONTAL
                 else f"{config.VERTICAL_IMAGE_SPAN}个格子"
             )
 
@@ -270,9 +276,7 @@ class ImageListWidget(QWidget):
             if not pixmap.isNull():
                 # 缩放到合适大小
                 max_size = 800
-                scaled_pixmap = pixmap.scaled(
-                    max_size, max_size, Qt.KeepAspectRatio, Qt.SmoothTransformation
-                )
+                scaled_pixmap = _scale_pixmap_to_fit(pixmap, max_size, max_size)
                 label.setPixmap(scaled_pixmap)
 
             layout.addWidget(label)
@@ -237,7 +237,7 @@ class MainWindow(QMainWindow):
                 will_replace = False
                 replaced_images = []
 
-                if selected_image.orientation == ImageOrientation.VERTICAL:
+                if selected_image.orientation is ImageOrientation.VERTICAL:
                     # 检查竖屏图片占用的所有格子
                     for r in range(
                         row, min(row + config.VERTICAL_IMAGE_SPAN, self.model.rows)
@@ -270,7 +270,7 @@ class MainWindow(QMainWindow):
                     self.set_modified(True)  # 标记为已修改
                 else:
                     # 检查失败原因
-                    if selected_image.orientation == ImageOrientation.VERTICAL:
+                    if selected_image.orientation is ImageOrientation.VERTICAL:
                         if row + config.VERTICAL_IMAGE_SPAN > self.model.rows:
                             QMessageBox.warning(
                                 self,
@@ -289,7 +289,7 @@ class MainWindow(QMainWindow):
     def _on_image_selected(self, image: ImageInfo):
         """处理图片选择"""
         orientation_text = (
-            "横屏" if image.orientation == ImageOrientation.HORIZONTAL else "竖屏"
+            "横屏" if image.orientation is ImageOrientation.HORIZONTAL else "竖屏"
         )
         self.status_bar.showMessage(
             f"已选择 {orientation_text} 图片: {image.path.name}"
@@ -334,9 +334,7 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            for row in range(self.model.rows):
-                for col in range(self.model.cols):
-                    self.model.remove_image(row, col)
+            self.model.clear_region(0, 0, self.model.rows, self.model.cols)
 
             self.grid_widget.refresh_display()
             self.image_list_widget.update_lists()
@@ -355,9 +353,7 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.Yes:
             # 先清空网格
-            for row in range(self.model.rows):
-                for col in range(self.model.cols):
-                    self.model.remove_image(row, col)
+            self.model.clear_region(0, 0, self.model.rows, self.model.cols)
 
             # 清空图片列表
             self.model.unused_images.clear()
@@ -484,14 +480,10 @@ class MainWindow(QMainWindow):
     def update_status(self):
         """更新状态栏"""
         # 网格状态
-        occupied_cells = 0
         total_cells = self.model.rows * self.model.cols
-
-        for row in range(self.model.rows):
-            for col in range(self.model.cols):
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied:
-                    occupied_cells += 1
+        occupied_cells = self.model.count_occupied(
+            0, 0, self.model.rows, self.model.cols
+        )
 
         self.grid_status_label.setText(
             f"网格: {self.model.rows}x{self.model.cols} ({occupied_cells}/{total_cells})"
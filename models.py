@@ -2,12 +2,25 @@
 """
 数据模型
 """
+import re
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Dict
 from dataclasses import dataclass
 from pathlib import Path
 
 
+# 格子状态编码，与 grid 同步维护的紧凑视图（每行一个 bytearray），用于快速区域统计
+CELL_EMPTY = 0  # 空闲
+CELL_HORIZONTAL = 1  # 横屏图片
+CELL_VERTICAL_MAIN = 2  # 竖屏图片主格子
+CELL_VERTICAL_SUB = 3  # 竖屏图片占位格子
+
+# 匹配主格子（横屏图片格子或竖屏图片主格子）的状态编码
+_MAIN_CELL_PATTERN = re.compile(b"[%c%c]" % (CELL_HORIZONTAL, CELL_VERTICAL_MAIN))
+# 匹配已占用格子（非空闲）的状态编码
+_OCCUPIED_CELL_PATTERN = re.compile(b"[^%c]" % CELL_EMPTY)
+
+
 class ImageOrientation(Enum):
     """图片方向枚举"""
 
@@ -52,9 +65,19 @@ class PuzzleModel:
         self.rows = rows
         self.cols = cols
         self.grid: List[List[GridCell]] = []
+        self.cell_states: List[bytearray] = []  # 格子状态编码视图
+        # 主格子索引 {(row, col): 图片}，按方向分别维护，便于按区域筛选图片而无需扫描格子
+        self.horizontal_mains: Dict[tuple, ImageInfo] = {}
+        self.vertical_mains: Dict[tuple, ImageInfo] = {}
+        # 占用位集，第 row * cols + col 位为1表示该格子已占用，随格子修改增量维护
+        self._occupied_bits = 0
         self.used_images: List[ImageInfo] = []
         self.unused_images: List[ImageInfo] = []
         self.image_directory: Optional[Path] = None  # 图片目录路径
+        self.version = 0  # 网格版本号，每次网格内容变化时递增，用于缓存失效
+        # 批量修改：嵌套层数和期间变化的格子范围 [start_row, start_col, end_row, end_col)
+        self._bulk_depth = 0
+        self._bulk_dirty: Optional[list] = None
         self._initialize_grid()
 
     def _initialize_grid(self):
@@ -65,6 +88,11 @@ class PuzzleModel:
             for col in range(self.cols):
                 grid_row.append(GridCell(row, col))
             self.grid.append(grid_row)
+        self.cell_states = [bytearray(self.cols) for _ in range(self.rows)]
+        self.horizontal_mains = {}
+        self.vertical_mains = {}
+        self._occupied_bits = 0
+        self.version += 1
 
     def resize_grid(self, rows: int, cols: int):
         """调整网格大小"""
@@ -89,7 +117,7 @@ class PuzzleModel:
         if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
             return False
 
-        if image.orientation == ImageOrientation.HORIZONTAL:
+        if image.orientation is ImageOrientation.HORIZONTAL:
             # 横屏图片只占一个格子
             return not self.grid[row][col].is_occupied
         else:
@@ -107,12 +135,16 @@ class PuzzleModel:
         if not self.can_place_image(row, col, image):
             return False
 
-        if image.orientation == ImageOrientation.HORIZONTAL:
+        if image.orientation is ImageOrientation.HORIZONTAL:
             # 横屏图片
             self.grid[row][col].image = image
             self.grid[row][col].is_occupied = True
             self.grid[row][col].is_main_cell = True
             self.grid[row][col].main_position = None  # 横屏图片无需main_position
+            self.cell_states[row][col] = CELL_HORIZONTAL
+            self.horizontal_mains[(row, col)] = image
+            self._occupied_bits |= 1 << (row * self.cols + col)
+            self._mark_dirty(row, col)
         else:
             # 竖屏图片占3个格子
             for i in range(3):
@@ -122,8 +154,15 @@ class PuzzleModel:
                 # 为非主格子设置main_position指向主格子
                 if i == 0:
                     self.grid[row + i][col].main_position = None  # 主格子自身
+                    self.cell_states[row + i][col] = CELL_VERTICAL_MAIN
+                    self.vertical_mains[(row, col)] = image
                 else:
                     self.grid[row + i][col].main_position = (row, col)  # 指向主格子
+                    self.cell_states[row + i][col] = CELL_VERTICAL_SUB
+                self._occupied_bits |= 1 << ((row + i) * self.cols + col)
+            self._mark_dirty(row, col, 3)
+
+        self.version += 1
 
         # 移动到已使用列表
         if image in self.unused_images:
@@ -138,33 +177,154 @@ class PuzzleModel:
         if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
             return None
 
+        # 按图片占用的格子清空，无需扫描整个网格
+        removed = self.clear_region(row, col, row + 1, col + 1)
+        return removed[0] if removed else None
+
+    def clear_region(
+        self, start_row: int, start_col: int, end_row: int, end_col: int
+    ) -> List[ImageInfo]:
+        """清空区域内的所有图片（结束行列不包含在内），返回被移除的图片
+
+        与区域相交的图片整体移除；只访问区域内已占用的格子和被移除图片的占用格子，
+        版本号只递增一次
+        """
+        # 按主格子坐标收集与区域相交的图片，保持行优先的发现顺序
+        removed_mains: Dict[tuple, ImageInfo] = {}
+        grid = self.grid
+        start_col = max(start_col, 0)
+        end_col = min(end_col, self.cols)
+        for row in range(max(start_row, 0), min(end_row, self.rows)):
+            grid_row = grid[row]
+            for match in _OCCUPIED_CELL_PATTERN.finditer(
+                self.cell_states[row], start_col, end_col
+            ):
+                cell = grid_row[match.start()]
+                main = cell.main_position or (row, cell.col)
+                if main not in removed_mains:
+                    removed_mains[main] = cell.image
+
+        if not removed_mains:
+            return []
+
+        for (row, col), image in removed_mains.items():
+            # 竖屏图片占3个格子（垂直方向）
+            height = 3 if self.cell_states[row][col] == CELL_VERTICAL_MAIN else 1
+            for r in range(row, row + height):
+                self._clear_cell(r, col)
+        self.version += 1
+
+        removed = list(removed_mains.values())
+        for image in removed:
+            self._mark_unused(image)
+
+        return removed
+
+    def _clear_cell(self, row: int, col: int):
+        """清空单元格及其索引（不递增版本号）"""
         cell = self.grid[row][col]
-        if not cell.is_occupied or not cell.image:
+        cell.image = None
+        cell.is_occupied = False
+        cell.is_main_cell = True
+        cell.main_position = None
+        self.cell_states[row][col] = CELL_EMPTY
+        self._occupied_bits &= ~(1 << (row * self.cols + col))
+        self.horizontal_mains.pop((row, col), None)
+        self.vertical_mains.pop((row, col), None)
+        self._mark_dirty(row, col)
+
+    def begin_bulk(self):
+        """开始批量修改，记录期间变化的格子范围（可嵌套）"""
+        if self._bulk_depth == 0:
+            self._bulk_dirty = None
+        self._bulk_depth += 1
+
+    def end_bulk(self) -> Optional[tuple]:
+        """结束批量修改
+
+        返回最外层批量修改期间变化的格子范围 (start_row, start_col, end_row, end_col)，
+        结束行列不包含在内；没有变化或仍在嵌套中时返回None
+        """
+        self._bulk_depth -= 1
+        if self._bulk_depth > 0 or self._bulk_dirty is None:
             return None
+        dirty = tuple(self._bulk_dirty)
+        self._bulk_dirty = None
+        return dirty
+
+    def _mark_dirty(self, row: int, col: int, height: int = 1):
+        """批量修改期间记录变化的格子范围"""
+        if not self._bulk_depth:
+            return
+        dirty = self._bulk_dirty
+        if dirty is None:
+            self._bulk_dirty = [row, col, row + height, col + 1]
+        else:
+            dirty[0] = min(dirty[0], row)
+            dirty[1] = min(dirty[1], col)
+            dirty[2] = max(dirty[2], row + height)
+            dirty[3] = max(dirty[3], col + 1)
 
-        image = cell.image
-
-        # 找到这个图片占据的所有格子并清空
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if self.grid[r][c].image == image:
-                    self.grid[r][c].image = None
-                    self.grid[r][c].is_occupied = False
-                    self.grid[r][c].is_main_cell = True
-                    self.grid[r][c].main_position = None  # 移动到未使用列表
+    def _mark_unused(self, image: ImageInfo):
+        """将图片移动到未使用列表"""
         if image in self.used_images:
             self.used_images.remove(image)
         if image not in self.unused_images:
             self.unused_images.append(image)
 
-        return image
-
     def get_cell(self, row: int, col: int) -> Optional[GridCell]:
         """获取单元格"""
         if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
             return None
         return self.grid[row][col]
 
+    def count_occupied(
+        self, start_row: int, start_col: int, end_row: int, end_col: int
+    ) -> int:
+        """统计区域内已占用的格子数（结束行列不包含在内）"""
+        count = 0
+        for states in self.cell_states[start_row:end_row]:
+            segment = states[start_col:end_col]
+            count += len(segment) - segment.count(CELL_EMPTY)
+        return count
+
+    def occupied_bits(self) -> int:
+        """占用位集，第 row * cols + col 位为1表示该格子已占用"""
+        return self._occupied_bits
+
+    def iter_main_cells(
+        self, start_row: int, start_col: int, end_row: int, end_col: int
+    ):
+        """按行优先顺序遍历区域内的主格子坐标 (row, col)（结束行列不包含在内）
+
+        图片数量少于区域格子数时直接筛选主格子索引，否则在状态编码上用正则匹配查找，
+        两种方式都不逐格访问 GridCell 对象
+        """
+        start_row = max(start_row, 0)
+        start_col = max(start_col, 0)
+        end_row = min(end_row, self.rows)
+        end_col = min(end_col, self.cols)
+        if end_row <= start_row or end_col <= start_col:
+            return
+
+        image_count = len(self.horizontal_mains) + len(self.vertical_mains)
+        if image_count < (end_row - start_row) * (end_col - start_col):
+            positions = [
+                (row, col)
+                for index in (self.horizontal_mains, self.vertical_mains)
+                for row, col in index
+                if start_row <= row < end_row and start_col <= col < end_col
+            ]
+            positions.sort()
+            yield from positions
+            return
+
+        for row in range(start_row, end_row):
+            for match in _MAIN_CELL_PATTERN.finditer(
+                self.cell_states[row], start_col, end_col
+            ):
+                yield row, match.start()
+
     def get_main_cell_position(self, row: int, col: int) -> tuple[int, int]:
         """
         获取指定位置对应的主格子位置
@@ -20,7 +20,7 @@ from PySide6.QtCore import Qt
 
 import config
 from models import PuzzleModel
-from puzzle_exporter import PuzzleExporter
+from puzzle_exporter import PuzzleExporter, clear_image_cache
 
 
 class PreviewWindow(QDialog):
@@ -124,6 +124,11 @@ class PreviewWindow(QDialog):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
 
+    def closeEvent(self, event):
+        """关闭窗口时释放图片缓存"""
+        clear_image_cache()
+        super().closeEvent(event)
+
     def _export_puzzle(self):
         """执行导出操作"""
         # 显示导出对话框
@@ -142,8 +147,7 @@ class PreviewWindow(QDialog):
 
             if save_path:
                 try:
-                    exporter = PuzzleExporter(self.model)
-                    exporter.export_to_file(
+                    self.exporter.export_to_file(
                         save_path, cell_width, cell_height, custom_spacing
                     )
                     QMessageBox.information(
@@ -2,13 +2,43 @@
 """
 拼图导出器
 """
-from PySide6.QtGui import QPixmap, QPainter
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from PySide6.QtGui import QImage, QImageWriter, QPixmap, QPainter
 from PySide6.QtCore import Qt
 
 import config
 from models import PuzzleModel, ImageOrientation
 
 
+@lru_cache(maxsize=config.IMAGE_DECODE_CACHE_SIZE)
+def _decode_scaled_image(path: str, mtime: float, width: int, height: int) -> QImage:
+    """解码并缩放图片，只缓存缩放后的结果，不长期持有原始分辨率图片"""
+    source_image = QImage(path)
+    if source_image.isNull():
+        return source_image
+    # 缩放图片到目标尺寸，保持宽高比
+    return source_image.scaled(
+        width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation
+    )
+
+
+def _load_scaled_image(path: Path, width: int, height: int) -> QImage:
+    """加载缩放后的图片（带缓存），文件不存在时返回空图片"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return QImage()
+    return _decode_scaled_image(str(path), mtime, width, height)
+
+
+def clear_image_cache():
+    """清空缩放图片缓存"""
+    _decode_scaled_image.cache_clear()
+
+
 class PuzzleExporter:
     """拼图导出器"""
 
@@ -17,34 +47,34 @@ class PuzzleExporter:
 
     def get_valid_area(self):
         """计算有效区域（包含图片的区域）"""
-        min_row, max_row = None, None
-        min_col, max_col = None, None
-
-        for row in range(self.model.rows):
-            for col in range(self.model.cols):
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied and cell.is_main_cell:
+        rows = self.model.rows
+        cols = self.model.cols
+        # 用整数初始化边界，避免每个格子都做 None 判断
+        min_row, max_row = rows, -1
+        min_col, max_col = cols, -1
+
+        for row, row_cells in enumerate(self.model.grid):
+            for col, cell in enumerate(row_cells):
+                if cell.is_occupied and cell.is_main_cell:
                     # 更新边界
-                    if min_row is None or row < min_row:
+                    if row < min_row:
                         min_row = row
-                    if max_row is None or row > max_row:
+                    if row > max_row:
                         max_row = row
-                    if min_col is None or col < min_col:
+                    if col < min_col:
                         min_col = col
-                    if max_col is None or col > max_col:
+                    if col > max_col:
                         max_col = col
 
                     # 对于竖屏图片，需要考虑它占用的额外行
                     if (
                         cell.image
-                        and cell.image.orientation == ImageOrientation.VERTICAL
+                        and cell.image.orientation is ImageOrientation.VERTICAL
                     ):
-                        bottom_row = row + config.VERTICAL_IMAGE_SPAN - 1
-                        if max_row is None or bottom_row > max_row:
-                            max_row = bottom_row
+                        max_row = max(max_row, row + config.VERTICAL_IMAGE_SPAN - 1)
 
         # 如果没有找到图片，返回None
-        if min_row is None:
+        if max_row < 0:
             return None
 
         return min_row, max_row, min_col, max_col
@@ -133,7 +163,8 @@ class PuzzleExporter:
         bg_color=Qt.white,
         draw_grid=False,
         custom_spacing=None,
-    ):
+        as_image=False,
+    ) -> QPixmap | QImage:
         """
         创建拼图图片
 
@@ -143,6 +174,7 @@ class PuzzleExporter:
             bg_color: 背景颜色，默认为白色
             draw_grid: 是否绘制网格线，突出显示间隔
             custom_spacing: 自定义间隔，如果为None则自动计算
+            as_image: 是否直接绘制到QImage（导出时使用，省去QPixmap到QImage的转换）
         """
         # 计算有效区域
         valid_area = self.get_valid_area()
@@ -179,11 +211,14 @@ class PuzzleExporter:
         )
 
         # 创建输出图片
-        output_pixmap = QPixmap(total_width, total_height)
+        if as_image:
+            canvas = QImage(total_width, total_height, QImage.Format_RGB32)
+        else:
+            canvas = QPixmap(total_width, total_height)
         # 使用浅灰色背景，使间隔更明显
-        output_pixmap.fill(Qt.lightGray if draw_grid else bg_color)
+        canvas.fill(Qt.lightGray if draw_grid else bg_color)
 
-        painter = QPainter(output_pixmap)
+        painter = QPainter(canvas)
         try:
             # 绘制网格线，显示间隔
             if draw_grid:
@@ -197,12 +232,24 @@ class PuzzleExporter:
                     y = row * (cell_height + spacing) - spacing // 2
                     painter.drawLine(0, y, total_width, y)
 
+            # 目标尺寸在循环外预先计算
+            # 横屏图片：标准1个格子
+            horizontal_size = (cell_width, cell_height)
+            # 竖屏图片：宽度 = 1个格子宽度，高度 = 3个格子高度 + 2个间隔
+            vertical_size = (
+                cell_width,
+                cell_height * config.VERTICAL_IMAGE_SPAN
+                + spacing * (config.VERTICAL_IMAGE_SPAN - 1),
+            )
+
             # 只遍历有效区域
+            grid = self.model.grid
             for row in range(min_row, max_row + 1):
+                row_cells = grid[row]
                 for col in range(min_col, max_col + 1):
-                    cell = self.model.get_cell(row, col)
+                    cell = row_cells[col]
 
-                    if cell and cell.is_occupied and cell.image and cell.is_main_cell:
+                    if cell.is_occupied and cell.image and cell.is_main_cell:
                         # 计算相对于有效区域的位置
                         relative_row = row - min_row
                         relative_col = col - min_col
@@ -213,18 +260,11 @@ class PuzzleExporter:
                         # y位置：行数 * (格子高度 + 间隔)
                         y = relative_row * (cell_height + spacing)
 
-                        # 计算目标尺寸
-                        if cell.image.orientation == ImageOrientation.VERTICAL:
-                            # 竖屏图片：宽度 = 1个格子宽度，高度 = 3个格子高度 + 2个间隔
-                            target_width = cell_width
-                            target_height = (
-                                cell_height * config.VERTICAL_IMAGE_SPAN
-                                + spacing * (config.VERTICAL_IMAGE_SPAN - 1)
-                            )
+                        # 目标尺寸
+                        if cell.image.orientation is ImageOrientation.VERTICAL:
+                            target_width, target_height = vertical_size
                         else:
-                            # 横屏图片：标准1个格子
-                            target_width = cell_width
-                            target_height = cell_height
+                            target_width, target_height = horizontal_size
 
                         # 绘制单元格背景（如果需要显示间隔）
                         if draw_grid:
@@ -233,37 +273,44 @@ class PuzzleExporter:
                             )
 
                         # 加载并缩放图片
-                        source_pixmap = QPixmap(str(cell.image.path))
-                        if not source_pixmap.isNull():
-                            # 缩放图片到目标尺寸，保持宽高比
-                            scaled_pixmap = source_pixmap.scaled(
-                                target_width,
-                                target_height,
-                                Qt.KeepAspectRatio,
-                                Qt.SmoothTransformation,
-                            )
-
+                        scaled_image = _load_scaled_image(
+                            cell.image.path, target_width, target_height
+                        )
+                        if not scaled_image.isNull():
                             # 居中绘制
-                            draw_x = x + (target_width - scaled_pixmap.width()) // 2
-                            draw_y = y + (target_height - scaled_pixmap.height()) // 2
+                            draw_x = x + (target_width - scaled_image.width()) // 2
+                            draw_y = y + (target_height - scaled_image.height()) // 2
 
-                            painter.drawPixmap(draw_x, draw_y, scaled_pixmap)
+                            painter.drawImage(draw_x, draw_y, scaled_image)
 
         finally:
             painter.end()
 
-        return output_pixmap
+        return canvas
 
     def export_to_file(
         self, save_path: str, cell_width: int, cell_height: int, custom_spacing=None
     ):
         """导出拼图到文件"""
         # 导出时不显示网格线，使用纯白色背景
-        output_pixmap = self.create_puzzle_image(
-            cell_width,
-            cell_height,
-            bg_color=Qt.white,
-            draw_grid=False,
-            custom_spacing=custom_spacing,
-        )
-        output_pixmap.save(save_path)
+        try:
+            output_image = self.create_puzzle_image(
+                cell_width,
+                cell_height,
+                bg_color=Qt.white,
+                draw_grid=False,
+                custom_spacing=custom_spacing,
+                as_image=True,
+            )
+        finally:
+            # 导出尺寸的缩放图片通常很大且只用一次，导出后立即释放
+            clear_image_cache()
+
+        # 直接用QImageWriter编码写盘，避免QPixmap.save内部再转换一次整幅图片
+        writer = QImageWriter(save_path)
+        # 质量参数只对JPEG生效；PNG保持默认(-1)，否则会被映射为不压缩
+        if Path(save_path).suffix.lower() in (".jpg", ".jpeg"):
+            writer.setQuality(95)
+            writer.setOptimizedWrite(True)
+        if not writer.write(output_image):
+            raise IOError(f"写入图片失败: {writer.errorString()}")
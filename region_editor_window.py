@@ -2,6 +2,9 @@
 """
 区域编辑窗口
 """
+import logging
+from typing import NamedTuple
+
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -12,10 +15,16 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QWidget,
 )
-from PySide6.QtCore import Qt, QRect
+from PySide6.QtCore import Qt, QRect, QSignalBlocker, QTimer, Slot
 
 import config
-from models import PuzzleModel, ImageOrientation
+from models import (
+    CELL_VERTICAL_MAIN,
+    CELL_VERTICAL_SUB,
+    PuzzleModel,
+    ImageInfo,
+    ImageOrientation,
+)
 from grid_preview_widget import GridPreviewWidget
 from direction_grid_widget import DirectionGridWidget
 
@@ -38,8 +47,66 @@ LAYOUT_MARGIN = 10
 LAYOUT_SPACING = 10
 BUTTON_LAYOUT_SPACING = 5
 
+# 状态信息刷新防抖间隔（毫秒），连续移动、拖拽或调整数值时只在停顿后刷新一次
+STATUS_UPDATE_DELAY_MS = 30
+
+# 清空完成提示在主窗口状态栏的显示时长（毫秒）
+CLEAR_MESSAGE_TIMEOUT_MS = 3000
+
+# 清空区域的格子数超过该值时才弹出确认对话框，小区域直接清空
+CLEAR_CONFIRM_MIN_CELLS = 4
+
+# 区域扫描缓存容量
+REGION_CACHE_SIZE = 64
+
+# 调试配置：智能扩展时是否逐格输出格子状态，以及是否输出静默调用的调试信息
+EXPAND_DEBUG_VERBOSE = False
+
 # ==============================
 
+logger = logging.getLogger(__name__)
+
+
+class VerticalImageEntry(NamedTuple):
+    """与区域相交的竖屏图片"""
+
+    row: int  # 主格子行
+    col: int  # 主格子列
+    image: ImageInfo
+    start_row: int  # 占用的起始行
+    end_row: int  # 占用的结束行（不包含）
+    height: int  # 占用的行数
+
+    @property
+    def occupied_cells(self) -> frozenset:
+        """占用的所有格子坐标集合（按需生成，不随扫描结果保存）"""
+        col = self.col
+        return frozenset((row, col) for row in range(self.start_row, self.end_row))
+
+
+class HorizontalImageEntry(NamedTuple):
+    """区域内的横屏图片"""
+
+    row: int
+    col: int
+    image: ImageInfo
+
+    @property
+    def occupied_cells(self) -> frozenset:
+        """占用的所有格子坐标集合"""
+        return frozenset(((self.row, self.col),))
+
+
+class RegionScan(NamedTuple):
+    """区域扫描结果"""
+
+    total: int  # 区域格子总数
+    occupied: int  # 已占用格子数
+    vertical_images: list  # 与区域相交的竖屏图片信息
+    horizontal_images: list  # 区域内的横屏图片信息
+    covered_top: int  # 区域与相交竖屏图片行范围并集的起始行
+    covered_bottom: int  # 区域与相交竖屏图片行范围并集的结束行（不包含）
+
 
 class RegionEditorWindow(QDialog):
     """区域编辑窗口"""
@@ -47,6 +114,33 @@ class RegionEditorWindow(QDialog):
     def __init__(self, model: PuzzleModel, parent=None):
         super().__init__(parent)
         self.model = model
+        # 主窗口引用，刷新时直接使用，无需每次调用 parent()
+        self._main_window = parent
+        # 区域扫描缓存，键为 (left, top, width, height, 模型版本号)
+        self._region_cache = {}
+        # 复用的提示框，按(图标, 标题)缓存，避免每次提示都重新构建对话框
+        self._message_boxes = {}
+        # 最近一次确认无需扩展的 (left, top, width, height, 模型版本号)
+        self._expanded_key = None
+        # 状态栏当前显示内容对应的 (left, top, width, height, 模型版本号)
+        self._status_key = None
+        # 移动后的选区由编辑器持有并原地平移，避免每次移动新建 QRect
+        self._selection_rect = QRect()
+        # 上次刷新预览时的模型版本号，重复显示窗口时据此跳过刷新
+        self._painted_version = -1
+        # 连续移动时合并主窗口刷新，记录尚未刷新的格子范围
+        self._refresh_pending = False
+        self._refresh_region = None
+        # 状态信息防抖定时器
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(STATUS_UPDATE_DELAY_MS)
+        self._status_timer.timeout.connect(self._update_status)
+        # SpinBox 连续变化时合并为一次区域更新（事件循环空闲时执行）
+        self._selected_area_timer = QTimer(self)
+        self._selected_area_timer.setSingleShot(True)
+        self._selected_area_timer.setInterval(0)
+        self._selected_area_timer.timeout.connect(self._update_selected_area)
         self.setWindowTitle(WINDOW_TITLE)
         self.setModal(False)
 
@@ -74,10 +168,20 @@ class RegionEditorWindow(QDialog):
         self.update_preview()
 
     def showEvent(self, event):
-        """窗口显示时刷新预览"""
+        """窗口显示时刷新预览（隐藏期间跳过的刷新在此补上）"""
         super().showEvent(event)
         self.update_preview()
 
+    def _show_message(self, icon, title: str, text: str):
+        """显示模态提示框，复用已创建的同类对话框"""
+        box = self._message_boxes.get((icon, title))
+        if box is None:
+            box = QMessageBox(icon, title, text, QMessageBox.Ok, self)
+            self._message_boxes[(icon, title)] = box
+        elif box.text() != text:
+            box.setText(text)
+        box.exec()
+
     def setup_ui(self):
         """设置界面"""
         layout = QVBoxLayout(self)
@@ -140,7 +244,7 @@ class RegionEditorWindow(QDialog):
         self.start_row_spinbox = QSpinBox()
         self.start_row_spinbox.setFixedHeight(25)
         self.start_row_spinbox.setRange(0, self.model.rows - 1)
-        self.start_row_spinbox.valueChanged.connect(self._update_selected_area)
+        self.start_row_spinbox.valueChanged.connect(self._schedule_selected_area_update)
         start_row_layout.addWidget(self.start_row_spinbox)
 
         # 起始列 - 紧凑布局
@@ -152,7 +256,7 @@ class RegionEditorWindow(QDialog):
         self.start_col_spinbox = QSpinBox()
         self.start_col_spinbox.setFixedHeight(25)
         self.start_col_spinbox.setRange(0, self.model.cols - 1)
-        self.start_col_spinbox.valueChanged.connect(self._update_selected_area)
+        self.start_col_spinbox.valueChanged.connect(self._schedule_selected_area_update)
         start_col_layout.addWidget(self.start_col_spinbox)
 
         # 行数 - 紧凑布局
@@ -164,7 +268,7 @@ class RegionEditorWindow(QDialog):
         self.rows_spinbox = QSpinBox()
         self.rows_spinbox.setFixedHeight(25)
         self.rows_spinbox.setRange(1, self.model.rows)
-        self.rows_spinbox.valueChanged.connect(self._update_selected_area)
+        self.rows_spinbox.valueChanged.connect(self._schedule_selected_area_update)
         rows_layout.addWidget(self.rows_spinbox)
 
         # 列数 - 紧凑布局
@@ -176,7 +280,7 @@ class RegionEditorWindow(QDialog):
         self.cols_spinbox = QSpinBox()
         self.cols_spinbox.setFixedHeight(25)
         self.cols_spinbox.setRange(1, self.model.cols)
-        self.cols_spinbox.valueChanged.connect(self._update_selected_area)
+        self.cols_spinbox.valueChanged.connect(self._schedule_selected_area_update)
         cols_layout.addWidget(self.cols_spinbox)
 
         row_col_layout.addLayout(start_row_layout)
@@ -244,7 +348,7 @@ class RegionEditorWindow(QDialog):
 
         refresh_button = QPushButton("刷新预览")
         refresh_button.setFixedHeight(30)
-        refresh_button.clicked.connect(self.update_preview)
+        refresh_button.clicked.connect(self._refresh_preview)
         button_layout.addWidget(refresh_button)
 
         close_button = QPushButton("关闭")
@@ -275,138 +379,218 @@ class RegionEditorWindow(QDialog):
         layout.setContentsMargins(5, 5, 5, 5)  # 减少边距
         layout.setSpacing(5)  # 减少间距
 
-    def update_preview(self):
-        """更新预览"""
+    def update_preview(self, force: bool = False):
+        """更新预览，模型未变化时跳过（force=True 时总是刷新）"""
+        # 窗口隐藏时不做任何刷新，重新显示时由 showEvent 统一刷新
+        if not self.isVisible():
+            return
+        version = self.model.version
+        if not force and version == self._painted_version:
+            return
+        self._painted_version = version
         self.grid_preview.update()
         self._update_status()
 
+    @Slot()
+    def _refresh_preview(self):
+        """刷新预览按钮：强制重绘并重新计算状态信息"""
+        self._status_key = None
+        self.update_preview(force=True)
+
+    def _schedule_status_update(self):
+        """延迟刷新状态信息，连续触发时只执行最后一次"""
+        self._status_timer.start()
+
+    @Slot()
     def _update_status(self):
         """更新状态信息"""
-        current_rect = self.grid_preview.selected_rect
-        if current_rect.isNull():
+        # 已直接刷新，取消尚未执行的延迟刷新
+        self._status_timer.stop()
+        if not self.isVisible():
+            return
+        if not self.grid_preview.has_selection:
+            self._status_key = None
             self.status_label.setText("请选择一个区域")
             return
+        current_rect = self.grid_preview.selected_rect
 
-        # 计算区域内的图片数量
-        occupied_count = 0
-        total_cells = current_rect.width() * current_rect.height()
-
-        # QRect: left()=col, top()=row, right()=col+width, bottom()=row+height
-        start_row = current_rect.top()
-        start_col = current_rect.left()
-        end_row = current_rect.top() + current_rect.height()
-        end_col = current_rect.left() + current_rect.width()
-
-        print(f"DEBUG _update_status: current_rect = {current_rect}")
-        print(
-            f"DEBUG _update_status: start_row={start_row}, start_col={start_col}, end_row={end_row}, end_col={end_col}"
-        )
-        print(
-            f"DEBUG _update_status: width={current_rect.width()}, height={current_rect.height()}"
-        )
-
-        # 获取图片统计信息
-        vertical_images = self.get_vertical_images_in_region(current_rect)
-        horizontal_images = self.get_horizontal_images_in_region(current_rect)
+        # 一次取出区域坐标，QRect(left, top, width, height) = (col, row, 列数, 行数)
+        start_col, start_row, width, height = current_rect.getRect()
+        # 区域和模型都未变化时状态文本不变，无需重新扫描和格式化
+        status_key = (start_col, start_row, width, height, self.model.version)
+        if status_key == self._status_key:
+            return
+        self._status_key = status_key
+        end_row = start_row + height
+        end_col = start_col + width
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "_update_status: start_row=%d, start_col=%d, end_row=%d, end_col=%d, "
+                "width=%d, height=%d",
+                start_row,
+                start_col,
+                end_row,
+                end_col,
+                width,
+                height,
+            )
 
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied:
-                    occupied_count += 1
+        # 获取图片统计信息（单次扫描）
+        scan = self._scan_region(current_rect)
+        total_cells = scan.total
+        occupied_count = scan.occupied
+        vertical_images = scan.vertical_images
+        horizontal_images = scan.horizontal_images
 
         status_text = (
             f"选中区域: 行({start_row}-{end_row-1}) 列({start_col}-{end_col-1}) | "
-            f"大小: {current_rect.height()}行x{current_rect.width()}列 | "
+            f"大小: {height}行x{width}列 | "
             f"已占用: {occupied_count}/{total_cells} 格子 | "
             f"横屏: {len(horizontal_images)} 竖屏: {len(vertical_images)}"
         )
         self.status_label.setText(status_text)
 
+    @Slot()
+    def _schedule_selected_area_update(self):
+        """延迟到事件循环空闲时更新选中区域，合并同一轮内的多次SpinBox变化"""
+        if not self._selected_area_timer.isActive():
+            self._selected_area_timer.start()
+
+    def _post_refresh(self, region: tuple):
+        """延迟到事件循环空闲时刷新显示，合并连续移动的变化范围"""
+        pending = self._refresh_region
+        if pending is None:
+            self._refresh_region = region
+        else:
+            self._refresh_region = (
+                min(pending[0], region[0]),
+                min(pending[1], region[1]),
+                max(pending[2], region[2]),
+                max(pending[3], region[3]),
+            )
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        QTimer.singleShot(0, self._do_refresh)
+
+    @Slot()
+    def _do_refresh(self):
+        """执行合并后的显示刷新"""
+        if not self._refresh_pending:
+            return
+        self._refresh_pending = False
+        region = self._refresh_region
+        self._refresh_region = None
+        self.grid_preview.update()
+        main_window = self._main_window
+        if main_window is not None:
+            # 更新主窗口显示
+            main_window.grid_widget.refresh_display(region)
+            main_window.image_list_widget.update_lists()
+            main_window.set_modified(True)  # 标记主窗口为已修改
+
+    @Slot()
     def _update_selected_area(self):
         """更新选中区域"""
+        # 已直接更新，取消尚未执行的合并更新
+        self._selected_area_timer.stop()
         start_row = self.start_row_spinbox.value()
         start_col = self.start_col_spinbox.value()
         rows = self.rows_spinbox.value()
         cols = self.cols_spinbox.value()
 
-        print(
-            f"DEBUG _update_selected_area: start_row={start_row}, start_col={start_col}, rows={rows}, cols={cols}"
-        )
-
         # 确保区域不超过网格范围
         end_row = min(start_row + rows, self.model.rows)
         end_col = min(start_col + cols, self.model.cols)
 
-        print(f"DEBUG _update_selected_area: end_row={end_row}, end_col={end_col}")
-        print(
-            f"DEBUG _update_selected_area: calculated width={end_col - start_col}, height={end_row - start_row}"
-        )
-
         # QRect(left, top, width, height) -> QRect(col, row, width, height)
         selected_rect = QRect(
             start_col, start_row, end_col - start_col, end_row - start_row
         )
 
-        print(f"DEBUG _update_selected_area: created QRect = {selected_rect}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "_update_selected_area: start_row=%d, start_col=%d, rows=%d, cols=%d "
+                "-> %s",
+                start_row,
+                start_col,
+                rows,
+                cols,
+                selected_rect,
+            )
 
         self.grid_preview.set_selected_area(selected_rect)
-        self._update_status()
+        self._schedule_status_update()
 
+    @Slot()
     def _move_up(self):
         """向上移动区域内的图片"""
-        current_rect = self.grid_preview.selected_rect
-        if current_rect.isNull():
-            QMessageBox.information(self, "提示", "请先选择一个区域")
+        if not self.grid_preview.has_selection:
+            self._show_message(QMessageBox.Information, "提示", "请先选择一个区域")
             return
 
         # 先自动扩展区域以包含完整的竖屏图片
         self._auto_expand_for_vertical_images(silent=True)
         current_rect = self.grid_preview.selected_rect
+        start_col, start_row, width, height = current_rect.getRect()
+        end_row = start_row + height
+        end_col = start_col + width
 
         # 检查是否可以向上移动
-        start_row = current_rect.top()
         if start_row == 0:
-            QMessageBox.warning(self, "移动失败", "选中区域已在最上方，无法向上移动")
+            self._show_message(
+                QMessageBox.Warning, "移动失败", "选中区域已在最上方，无法向上移动"
+            )
             return
 
         # 收集区域内所有需要移动的图片
         images_to_move = []
-        start_col = current_rect.left()
-        end_row = current_rect.top() + current_rect.height()
-        end_col = current_rect.left() + current_rect.width()
-
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied and cell.is_main_cell:
-                    new_row = row - 1
-                    # 检查是否超出边界
-                    if cell.image.orientation == ImageOrientation.VERTICAL:
-                        if new_row < 0:
-                            QMessageBox.warning(
-                                self, "移动失败", "向上移动会导致竖屏图片超出网格边界"
-                            )
-                            return
-                    else:
-                        if new_row < 0:
-                            QMessageBox.warning(
-                                self, "移动失败", "向上移动会导致图片超出网格边界"
-                            )
-                            return
-
-                    images_to_move.append(
-                        {
-                            "image": cell.image,
-                            "old_row": row,
-                            "old_col": col,
-                            "new_row": new_row,
-                            "new_col": col,
-                        }
+
+        # 只访问区域内的主格子，跳过空闲格子和竖屏图片的占位格子
+        grid = self.model.grid
+        vertical = ImageOrientation.VERTICAL
+        span = config.VERTICAL_IMAGE_SPAN
+        for row, col in self.model.iter_main_cells(
+            start_row, start_col, end_row, end_col
+        ):
+            cell = grid[row][col]
+            new_row = row - 1
+            # 图片占用的行数在本次操作内只判断一次，执行移动时直接复用
+            item_height = span if cell.image.orientation is vertical else 1
+            # 检查是否超出边界
+            if item_height > 1:
+                if new_row < 0:
+                    self._show_message(
+                        QMessageBox.Warning,
+                        "移动失败",
+                        "向上移动会导致竖屏图片超出网格边界",
+                    )
+                    return
+            else:
+                if new_row < 0:
+                    self._show_message(
+                        QMessageBox.Warning,
+                        "移动失败",
+                        "向上移动会导致图片超出网格边界",
                     )
+                    return
+
+            images_to_move.append(
+                {
+                    "image": cell.image,
+                    "old_row": row,
+                    "old_col": col,
+                    "new_row": new_row,
+                    "new_col": col,
+                    "height": item_height,
+                }
+            )
 
         if not images_to_move:
-            QMessageBox.information(self, "提示", "选中区域内没有图片需要移动")
+            self._show_message(
+                QMessageBox.Information, "提示", "选中区域内没有图片需要移动"
+            )
             return
 
         # 执行移动：自动清空冲突位置
@@ -414,65 +598,76 @@ class RegionEditorWindow(QDialog):
 
         # 如果移动成功，同时移动选中区域
         if success:
-            new_rect = QRect(
-                current_rect.left(),
-                current_rect.top() - 1,
-                current_rect.width(),
-                current_rect.height(),
-            )
-            self._update_spinboxes_from_rect(new_rect)
-            self.grid_preview.set_selected_area(new_rect)
-            self._update_status()
-
+            # 选区可能已被拖拽、预设或 SpinBox 改变，先同步再原地平移
+            selection_rect = self._selection_rect
+            selection_rect.setRect(start_col, start_row, width, height)
+            selection_rect.translate(0, -1)
+            self._update_spinboxes_from_rect(selection_rect)
+            self.grid_preview.set_selected_area(selection_rect)
+            self._schedule_status_update()
+
+    @Slot()
     def _move_down(self):
         """向下移动区域内的图片"""
-        current_rect = self.grid_preview.selected_rect
-        if current_rect.isNull():
-            QMessageBox.information(self, "提示", "请先选择一个区域")
+        if not self.grid_preview.has_selection:
+            self._show_message(QMessageBox.Information, "提示", "请先选择一个区域")
             return
 
         # 先自动扩展区域以包含完整的竖屏图片
         self._auto_expand_for_vertical_images(silent=True)
         current_rect = self.grid_preview.selected_rect
+        start_col, start_row, width, height = current_rect.getRect()
+        end_row = start_row + height
+        end_col = start_col + width
 
         # 收集区域内所有需要移动的图片
         images_to_move = []
-        start_row = current_rect.top()
-        start_col = current_rect.left()
-        end_row = current_rect.top() + current_rect.height()
-        end_col = current_rect.left() + current_rect.width()
-
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied and cell.is_main_cell:
-                    new_row = row + 1
-                    # 检查是否超出边界
-                    if cell.image.orientation == ImageOrientation.VERTICAL:
-                        if new_row + config.VERTICAL_IMAGE_SPAN > self.model.rows:
-                            QMessageBox.warning(
-                                self, "移动失败", "向下移动会导致竖屏图片超出网格边界"
-                            )
-                            return
-                    else:
-                        if new_row >= self.model.rows:
-                            QMessageBox.warning(
-                                self, "移动失败", "向下移动会导致图片超出网格边界"
-                            )
-                            return
-
-                    images_to_move.append(
-                        {
-                            "image": cell.image,
-                            "old_row": row,
-                            "old_col": col,
-                            "new_row": new_row,
-                            "new_col": col,
-                        }
+
+        # 只访问区域内的主格子，跳过空闲格子和竖屏图片的占位格子
+        grid = self.model.grid
+        vertical = ImageOrientation.VERTICAL
+        span = config.VERTICAL_IMAGE_SPAN
+        rows = self.model.rows
+        for row, col in self.model.iter_main_cells(
+            start_row, start_col, end_row, end_col
+        ):
+            cell = grid[row][col]
+            new_row = row + 1
+            # 图片占用的行数在本次操作内只判断一次，执行移动时直接复用
+            item_height = span if cell.image.orientation is vertical else 1
+            # 检查是否超出边界
+            if item_height > 1:
+                if new_row + span > rows:
+                    self._show_message(
+                        QMessageBox.Warning,
+                        "移动失败",
+                        "向下移动会导致竖屏图片超出网格边界",
                     )
+                    return
+            else:
+                if new_row >= rows:
+                    self._show_message(
+                        QMessageBox.Warning,
+                        "移动失败",
+                        "向下移动会导致图片超出网格边界",
+                    )
+                    return
+
+            images_to_move.append(
+                {
+                    "image": cell.image,
+                    "old_row": row,
+                    "old_col": col,
+                    "new_row": new_row,
+                    "new_col": col,
+                    "height": item_height,
+                }
+            )
 
         if not images_to_move:
-            QMessageBox.information(self, "提示", "选中区域内没有图片需要移动")
+            self._show_message(
+                QMessageBox.Information, "提示", "选中区域内没有图片需要移动"
+            )
             return
 
         # 执行移动：自动清空冲突位置
@@ -480,62 +675,68 @@ class RegionEditorWindow(QDialog):
 
         # 如果移动成功，同时移动选中区域
         if success:
-            new_rect = QRect(
-                current_rect.left(),
-                current_rect.top() + 1,
-                current_rect.width(),
-                current_rect.height(),
-            )
-            self._update_spinboxes_from_rect(new_rect)
-            self.grid_preview.set_selected_area(new_rect)
-            self._update_status()
-
+            # 选区可能已被拖拽、预设或 SpinBox 改变，先同步再原地平移
+            selection_rect = self._selection_rect
+            selection_rect.setRect(start_col, start_row, width, height)
+            selection_rect.translate(0, 1)
+            self._update_spinboxes_from_rect(selection_rect)
+            self.grid_preview.set_selected_area(selection_rect)
+            self._schedule_status_update()
+
+    @Slot()
     def _move_left(self):
         """向左移动区域内的图片"""
-        current_rect = self.grid_preview.selected_rect
-        if current_rect.isNull():
-            QMessageBox.information(self, "提示", "请先选择一个区域")
+        if not self.grid_preview.has_selection:
+            self._show_message(QMessageBox.Information, "提示", "请先选择一个区域")
             return
 
         # 先自动扩展区域以包含完整的竖屏图片
         self._auto_expand_for_vertical_images(silent=True)
         current_rect = self.grid_preview.selected_rect
+        start_col, start_row, width, height = current_rect.getRect()
+        end_row = start_row + height
+        end_col = start_col + width
 
         # 检查是否可以向左移动
-        start_col = current_rect.left()
         if start_col == 0:
-            QMessageBox.warning(self, "移动失败", "选中区域已在最左侧，无法向左移动")
+            self._show_message(
+                QMessageBox.Warning, "移动失败", "选中区域已在最左侧，无法向左移动"
+            )
             return
 
         # 收集区域内所有需要移动的图片
         images_to_move = []
-        start_row = current_rect.top()
-        end_row = current_rect.top() + current_rect.height()
-        end_col = current_rect.left() + current_rect.width()
-
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied and cell.is_main_cell:
-                    new_col = col - 1
-                    if new_col < 0:
-                        QMessageBox.warning(
-                            self, "移动失败", "向左移动会导致图片超出网格边界"
-                        )
-                        return
-
-                    images_to_move.append(
-                        {
-                            "image": cell.image,
-                            "old_row": row,
-                            "old_col": col,
-                            "new_row": row,
-                            "new_col": new_col,
-                        }
-                    )
+
+        # 只访问区域内的主格子，跳过空闲格子和竖屏图片的占位格子
+        grid = self.model.grid
+        vertical = ImageOrientation.VERTICAL
+        span = config.VERTICAL_IMAGE_SPAN
+        for row, col in self.model.iter_main_cells(
+            start_row, start_col, end_row, end_col
+        ):
+            cell = grid[row][col]
+            new_col = col - 1
+            if new_col < 0:
+                self._show_message(
+                    QMessageBox.Warning, "移动失败", "向左移动会导致图片超出网格边界"
+                )
+                return
+
+            images_to_move.append(
+                {
+                    "image": cell.image,
+                    "old_row": row,
+                    "old_col": col,
+                    "new_row": row,
+                    "new_col": new_col,
+                    "height": span if cell.image.orientation is vertical else 1,
+                }
+            )
 
         if not images_to_move:
-            QMessageBox.information(self, "提示", "选中区域内没有图片需要移动")
+            self._show_message(
+                QMessageBox.Information, "提示", "选中区域内没有图片需要移动"
+            )
             return
 
         # 执行移动：自动清空冲突位置
@@ -543,62 +744,68 @@ class RegionEditorWindow(QDialog):
 
         # 如果移动成功，同时移动选中区域
         if success:
-            new_rect = QRect(
-                current_rect.left() - 1,
-                current_rect.top(),
-                current_rect.width(),
-                current_rect.height(),
-            )
-            self._update_spinboxes_from_rect(new_rect)
-            self.grid_preview.set_selected_area(new_rect)
-            self._update_status()
-
+            # 选区可能已被拖拽、预设或 SpinBox 改变，先同步再原地平移
+            selection_rect = self._selection_rect
+            selection_rect.setRect(start_col, start_row, width, height)
+            selection_rect.translate(-1, 0)
+            self._update_spinboxes_from_rect(selection_rect)
+            self.grid_preview.set_selected_area(selection_rect)
+            self._schedule_status_update()
+
+    @Slot()
     def _move_right(self):
         """向右移动区域内的图片"""
-        current_rect = self.grid_preview.selected_rect
-        if current_rect.isNull():
-            QMessageBox.information(self, "提示", "请先选择一个区域")
+        if not self.grid_preview.has_selection:
+            self._show_message(QMessageBox.Information, "提示", "请先选择一个区域")
             return
 
         # 先自动扩展区域以包含完整的竖屏图片
         self._auto_expand_for_vertical_images(silent=True)
         current_rect = self.grid_preview.selected_rect
+        start_col, start_row, width, height = current_rect.getRect()
+        end_row = start_row + height
+        end_col = start_col + width
 
         # 检查是否可以向右移动
-        end_col = current_rect.left() + current_rect.width()
         if end_col >= self.model.cols:
-            QMessageBox.warning(self, "移动失败", "选中区域已在最右侧，无法向右移动")
+            self._show_message(
+                QMessageBox.Warning, "移动失败", "选中区域已在最右侧，无法向右移动"
+            )
             return
 
         # 收集区域内所有需要移动的图片
         images_to_move = []
-        start_row = current_rect.top()
-        start_col = current_rect.left()
-        end_row = current_rect.top() + current_rect.height()
-
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied and cell.is_main_cell:
-                    new_col = col + 1
-                    if new_col >= self.model.cols:
-                        QMessageBox.warning(
-                            self, "移动失败", "向右移动会导致图片超出网格边界"
-                        )
-                        return
-
-                    images_to_move.append(
-                        {
-                            "image": cell.image,
-                            "old_row": row,
-                            "old_col": col,
-                            "new_row": row,
-                            "new_col": new_col,
-                        }
-                    )
+
+        # 只访问区域内的主格子，跳过空闲格子和竖屏图片的占位格子
+        grid = self.model.grid
+        vertical = ImageOrientation.VERTICAL
+        span = config.VERTICAL_IMAGE_SPAN
+        for row, col in self.model.iter_main_cells(
+            start_row, start_col, end_row, end_col
+        ):
+            cell = grid[row][col]
+            new_col = col + 1
+            if new_col >= self.model.cols:
+                self._show_message(
+                    QMessageBox.Warning, "移动失败", "向右移动会导致图片超出网格边界"
+                )
+                return
+
+            images_to_move.append(
+                {
+                    "image": cell.image,
+                    "old_row": row,
+                    "old_col": col,
+                    "new_row": row,
+                    "new_col": new_col,
+                    "height": span if cell.image.orientation is vertical else 1,
+                }
+            )
 
         if not images_to_move:
-            QMessageBox.information(self, "提示", "选中区域内没有图片需要移动")
+            self._show_message(
+                QMessageBox.Information, "提示", "选中区域内没有图片需要移动"
+            )
             return
 
         # 执行移动：自动清空冲突位置
@@ -606,15 +813,13 @@ class RegionEditorWindow(QDialog):
 
         # 如果移动成功，同时移动选中区域
         if success:
-            new_rect = QRect(
-                current_rect.left() + 1,
-                current_rect.top(),
-                current_rect.width(),
-                current_rect.height(),
-            )
-            self._update_spinboxes_from_rect(new_rect)
-            self.grid_preview.set_selected_area(new_rect)
-            self._update_status()
+            # 选区可能已被拖拽、预设或 SpinBox 改变，先同步再原地平移
+            selection_rect = self._selection_rect
+            selection_rect.setRect(start_col, start_row, width, height)
+            selection_rect.translate(1, 0)
+            self._update_spinboxes_from_rect(selection_rect)
+            self.grid_preview.set_selected_area(selection_rect)
+            self._schedule_status_update()
 
     def _execute_region_move(self, images_to_move, current_rect):
         """执行区域移动操作"""
@@ -622,50 +827,54 @@ class RegionEditorWindow(QDialog):
             return False
 
         # 收集所有需要清空的位置（包括原位置和目标位置的所有冲突）
-        positions_to_clear = set()
-
-        # 首先添加所有原位置
-        for item in images_to_move:
-            if item["image"].orientation == ImageOrientation.VERTICAL:
-                for r in range(
-                    item["old_row"], item["old_row"] + config.VERTICAL_IMAGE_SPAN
-                ):
-                    positions_to_clear.add((r, item["old_col"]))
-            else:
-                positions_to_clear.add((item["old_row"], item["old_col"]))
+        # 用按 row * cols + col 编号的整数位集去重，代替坐标元组集合
+        rows = self.model.rows
+        cols = self.model.cols
+        clear_bits = 0
 
-        # 然后添加所有目标位置（包括可能的冲突位置）
         for item in images_to_move:
-            if item["image"].orientation == ImageOrientation.VERTICAL:
-                for r in range(
-                    item["new_row"], item["new_row"] + config.VERTICAL_IMAGE_SPAN
-                ):
-                    positions_to_clear.add((r, item["new_col"]))
-            else:
-                positions_to_clear.add((item["new_row"], item["new_col"]))
-
-        # 清空所有相关位置（这会自动处理冲突）
-        cleared_count = 0
-        for row, col in positions_to_clear:
-            if 0 <= row < self.model.rows and 0 <= col < self.model.cols:
-                cell = self.model.get_cell(row, col)
-                if cell and cell.is_occupied:
-                    self.model.remove_image(row, col)
+            height = item["height"]
+            # 原位置和目标位置（包括可能的冲突位置）
+            for base_row, col in (
+                (item["old_row"], item["old_col"]),
+                (item["new_row"], item["new_col"]),
+            ):
+                if not 0 <= col < cols:
+                    continue
+                for row in range(max(base_row, 0), min(base_row + height, rows)):
+                    clear_bits |= 1 << (row * cols + col)
+
+        # 与占用位集按位与，只保留确实有图片的位置
+        clear_bits &= self.model.occupied_bits()
+
+        # 批量修改模型，结束后只刷新变化的格子范围
+        self.model.begin_bulk()
+        try:
+            # 清空所有相关位置（这会自动处理冲突），每次取出最低的置位
+            cleared_count = 0
+            grid = self.model.grid
+            remove_image = self.model.remove_image
+            while clear_bits:
+                lowest = clear_bits & -clear_bits
+                clear_bits ^= lowest
+                row, col = divmod(lowest.bit_length() - 1, cols)
+                if grid[row][col].is_occupied:
+                    remove_image(row, col)
                     cleared_count += 1
 
-        # 再放置到新位置
-        moved_count = 0
-        for item in images_to_move:
-            if self.model.place_image(item["new_row"], item["new_col"], item["image"]):
-                moved_count += 1
+            # 再放置到新位置
+            moved_count = 0
+            place_image = self.model.place_image
+            for item in images_to_move:
+                if place_image(item["new_row"], item["new_col"], item["image"]):
+                    moved_count += 1
+        finally:
+            dirty_region = self.model.end_bulk()
 
-        # 更新显示
-        self.update_preview()
-        if self.parent():
-            # 更新主窗口显示
-            self.parent().grid_widget.refresh_display()
-            self.parent().image_list_widget.update_lists()
-            self.parent().set_modified(True)  # 标记主窗口为已修改
+        # 更新显示（刷新和状态信息都延迟执行，连续移动时合并为一次）
+        if dirty_region is not None:
+            self._post_refresh(dirty_region)
+        self._schedule_status_update()
 
         if moved_count > 0:
             message = f"已成功移动 {moved_count} 张图片"
@@ -673,19 +882,19 @@ class RegionEditorWindow(QDialog):
                 # 有额外的清空操作（说明清空了冲突的图片）
                 extra_cleared = cleared_count - len(images_to_move)
                 message += f"\n自动清空了 {extra_cleared} 个冲突位置"
-            QMessageBox.information(self, "移动完成", message)
+            self._show_message(QMessageBox.Information, "移动完成", message)
             return True
         else:
-            QMessageBox.warning(self, "移动失败", "没有图片成功移动")
+            self._show_message(QMessageBox.Warning, "移动失败", "没有图片成功移动")
             return False
 
+    @Slot(int, int)
     def _on_area_selected(self, row: int, col: int):
         """处理网格点击选择"""
         # 检查当前是否有拖拽选择的区域
         current_selected = self.grid_preview.selected_rect
-        if not current_selected.isNull() and (
-            current_selected.width() > 1 or current_selected.height() > 1
-        ):
+        _, _, width, height = current_selected.getRect()
+        if self.grid_preview.has_selection and (width > 1 or height > 1):
             # 如果已经有拖拽选择的区域，直接更新SpinBox，不要重新设置为1x1
             self._update_spinboxes_from_rect(current_selected)
             self._update_status()
@@ -696,380 +905,391 @@ class RegionEditorWindow(QDialog):
             self.grid_preview.set_selected_area(new_rect)
             self._update_status()
 
+    @Slot(QRect)
     def _on_area_drag_selected(self, rect: QRect):
         """处理拖拽选择区域"""
         self._update_spinboxes_from_rect(rect)
-        self._update_status()
+        self._schedule_status_update()
 
     def _update_spinboxes_from_rect(self, rect: QRect):
         """根据矩形区域更新SpinBox的值"""
-        # 临时阻止信号发送，避免循环触发
-        self.start_row_spinbox.blockSignals(True)
-        self.start_col_spinbox.blockSignals(True)
-        self.rows_spinbox.blockSignals(True)
-        self.cols_spinbox.blockSignals(True)
-
-        # 更新SpinBox的值
-        self.start_row_spinbox.setValue(rect.top())
-        self.start_col_spinbox.setValue(rect.left())
-        self.rows_spinbox.setValue(rect.height())
-        self.cols_spinbox.setValue(rect.width())
-
-        # 恢复信号发送
-        self.start_row_spinbox.blockSignals(False)
-        self.start_col_spinbox.blockSignals(False)
-        self.rows_spinbox.blockSignals(False)
-        self.cols_spinbox.blockSignals(False)
+        # 临时阻止信号发送，避免循环触发（退出时自动恢复，异常时也不会遗留阻塞）
+        left, top, width, height = rect.getRect()
+        spinbox_values = (
+            (self.start_row_spinbox, top),
+            (self.start_col_spinbox, left),
+            (self.rows_spinbox, height),
+            (self.cols_spinbox, width),
+        )
+        for spinbox, value in spinbox_values:
+            # 值未变化时跳过，避免无谓的信号阻塞和 setValue 调用
+            if spinbox.value() == value:
+                continue
+            with QSignalBlocker(spinbox):
+                spinbox.setValue(value)
+
+    def _apply_preset_rect(self, new_rect: QRect):
+        """应用快速选择的区域，并自动检查竖屏图片"""
+        # 批量更新期间暂停预览重绘，结束后统一刷新一次
+        self.grid_preview.setUpdatesEnabled(False)
+        try:
+            self._update_spinboxes_from_rect(new_rect)
+            self.grid_preview.set_selected_area(new_rect)
+            # 快速选择需要自动检查竖屏图片；扩展成功时已安排刷新状态信息
+            if not self._auto_expand_for_vertical_images(silent=True):
+                self._update_status()
+        finally:
+            self.grid_preview.setUpdatesEnabled(True)
 
+    @Slot()
     def _select_full_grid(self):
         """选择整个网格"""
-        new_rect = QRect(0, 0, self.model.cols, self.model.rows)
-        self._update_spinboxes_from_rect(new_rect)
-        self.grid_preview.set_selected_area(new_rect)
-        self._auto_expand_for_vertical_images(
-            silent=True
-        )  # 快速选择需要自动检查竖屏图片
-        self._update_status()
+        self._apply_preset_rect(QRect(0, 0, self.model.cols, self.model.rows))
 
+    @Slot()
     def _select_single_row(self):
         """选择单行（当前选中区域的起始行）"""
-        current_rect = self.grid_preview.selected_rect
-        start_row = current_rect.top() if not current_rect.isNull() else 0
-        new_rect = QRect(0, start_row, self.model.cols, 1)
-        self._update_spinboxes_from_rect(new_rect)
-        self.grid_preview.set_selected_area(new_rect)
-        self._auto_expand_for_vertical_images(
-            silent=True
-        )  # 快速选择需要自动检查竖屏图片
-        self._update_status()
+        preview = self.grid_preview
+        start_row = preview.selected_rect.top() if preview.has_selection else 0
+        self._apply_preset_rect(QRect(0, start_row, self.model.cols, 1))
 
+    @Slot()
     def _select_single_col(self):
         """选择单列（当前选中区域的起始列）"""
-        current_rect = self.grid_preview.selected_rect
-        start_col = current_rect.left() if not current_rect.isNull() else 0
-        new_rect = QRect(start_col, 0, 1, self.model.rows)
-        self._update_spinboxes_from_rect(new_rect)
-        self.grid_preview.set_selected_area(new_rect)
-        self._auto_expand_for_vertical_images(
-            silent=True
-        )  # 快速选择需要自动检查竖屏图片
-        self._update_status()
+        preview = self.grid_preview
+        start_col = preview.selected_rect.left() if preview.has_selection else 0
+        self._apply_preset_rect(QRect(start_col, 0, 1, self.model.rows))
+
+    def _scan_region(self, rect: QRect) -> RegionScan:
+        """扫描区域，按区域和模型版本号缓存扫描结果"""
+        key = (*rect.getRect(), self.model.version)
+        cache = self._region_cache
+        result = cache.pop(key, None)
+        if result is None:
+            if len(cache) >= REGION_CACHE_SIZE:
+                # 淘汰最久未使用的结果
+                del cache[next(iter(cache))]
+            result = self._scan_region_uncached(rect)
+        # 命中或新建的结果都放到末尾，字典顺序即最近使用顺序
+        cache[key] = result
+        return result
+
+    def _scan_region_uncached(self, rect: QRect) -> RegionScan:
+        """扫描区域，收集竖屏/横屏图片和占用统计"""
+        vertical_images = []
+        horizontal_images = []
+        if rect.isNull():
+            return RegionScan(0, 0, vertical_images, horizontal_images, 0, 0)
+
+        start_col, start_row, width, height = rect.getRect()
+        end_row = start_row + height
+        end_col = start_col + width
+
+        # 主格子通过模型的 iter_main_cells 查找（按图片数量自动选择索引或状态编码），
+        # 一次遍历同时得到竖屏和横屏图片，不逐格访问 GridCell 对象
+        # 竖屏图片与区域相交 <=> 主格子位于区域所在列，且主格子行号落在
+        # [start_row - SPAN + 1, end_row) 内；横屏图片的主格子必须在区域内
+        # 扫描时顺带求出竖屏图片行范围的并集，扩展区域时无需再遍历图片列表
+        model = self.model
+        states = model.cell_states
+        vertical_mains = model.vertical_mains
+        horizontal_mains = model.horizontal_mains
+        span = config.VERTICAL_IMAGE_SPAN
+        covered_top = start_row
+        covered_bottom = end_row
+        for row, col in model.iter_main_cells(
+            start_row - span + 1, start_col, end_row, end_col
+        ):
+            if states[row][col] == CELL_VERTICAL_MAIN:
+                if row < covered_top:
+                    covered_top = row
+                if row + span > covered_bottom:
+                    covered_bottom = row + span
+                vertical_images.append(
+                    VerticalImageEntry(
+                        row, col, vertical_mains[(row, col)], row, row + span, span
+                    )
+                )
+            elif row >= start_row:
+                horizontal_images.append(
+                    HorizontalImageEntry(row, col, horizontal_mains[(row, col)])
+                )
+
+        total = width * height
+        occupied = self.model.count_occupied(start_row, start_col, end_row, end_col)
+        return RegionScan(
+            total,
+            occupied,
+            vertical_images,
+            horizontal_images,
+            covered_top,
+            covered_bottom,
+        )
 
     def get_vertical_images_in_region(self, rect: QRect):
         """获取指定区域内的所有竖屏图片信息"""
-        vertical_images = []
-        if rect.isNull():
-            return vertical_images
-
-        start_row = rect.top()
-        start_col = rect.left()
-        end_row = rect.top() + rect.height()
-        end_col = rect.left() + rect.width()
-
-        # 用于记录已经处理过的竖屏图片，避免重复
-        processed_images = set()
-
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if (
-                    cell
-                    and cell.is_occupied
-                    and cell.image
-                    and cell.image.orientation == ImageOrientation.VERTICAL
-                ):
-                    # 获取主格子位置
-                    main_row, main_col = self.model.get_main_cell_position(row, col)
-
-                    # 用图片路径和主格子位置作为唯一标识
-                    image_key = (cell.image.path, main_row, main_col)
-
-                    if image_key not in processed_images:
-                        processed_images.add(image_key)
-                        vertical_images.append(
-                            {
-                                "row": main_row,
-                                "col": main_col,
-                                "image": cell.image,
-                                "start_row": main_row,
-                                "end_row": main_row + config.VERTICAL_IMAGE_SPAN,
-                                "occupied_cells": [
-                                    (main_row + i, main_col)
-                                    for i in range(config.VERTICAL_IMAGE_SPAN)
-                                ],
-                            }
-                        )
-        return vertical_images
+        return self._scan_region(rect).vertical_images
 
     def get_horizontal_images_in_region(self, rect: QRect):
         """获取指定区域内的所有横屏图片信息"""
-        horizontal_images = []
-        if rect.isNull():
-            return horizontal_images
-
-        start_row = rect.top()
-        start_col = rect.left()
-        end_row = rect.top() + rect.height()
-        end_col = rect.left() + rect.width()
-
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if (
-                    cell
-                    and cell.is_occupied
-                    and cell.image
-                    and cell.image.orientation == ImageOrientation.HORIZONTAL
-                    and cell.is_main_cell  # 横屏图片只有一个格子，都是主格子
-                ):
-                    horizontal_images.append(
-                        {
-                            "row": row,
-                            "col": col,
-                            "image": cell.image,
-                            "occupied_cells": [(row, col)],
-                        }
-                    )
-        return horizontal_images
+        return self._scan_region(rect).horizontal_images
 
+    @Slot()
     def _auto_expand_for_vertical_images(self, silent=False):
         """自动扩展选中区域以包含完整的竖屏图片
 
         Args:
-            silent (bool): 是否静默模式，静默模式不显示消息框但仍输出调试信息
+            silent (bool): 是否静默模式，静默模式不显示消息框
         """
-        current_rect = self.grid_preview.selected_rect
-        if current_rect.isNull():
+        if not self.grid_preview.has_selection:
             if not silent:
-                QMessageBox.information(self, "提示", "请先选择一个区域")
+                self._show_message(QMessageBox.Information, "提示", "请先选择一个区域")
             return False
+        current_rect = self.grid_preview.selected_rect
 
-        print(f"\n=== 智能扩展调试信息 ({'静默模式' if silent else '交互模式'}) ===")
-        print(
-            f"当前选中区域: 列{current_rect.left()}-{current_rect.left()+current_rect.width()-1} "
-            f"行{current_rect.top()}-{current_rect.top()+current_rect.height()-1} "
-            f"大小: {current_rect.width()}x{current_rect.height()}"
-        )
+        # 模型中没有任何竖屏图片时无需扫描区域
+        if not self.model.vertical_mains:
+            if not silent:
+                self._show_message(
+                    QMessageBox.Information, "提示", "选中区域内没有竖屏图片"
+                )
+            return False
 
-        # 检查区域内所有格子的状态
-        print("区域内所有格子的状态:")
-        start_row = current_rect.top()
-        start_col = current_rect.left()
-        end_row = current_rect.top() + current_rect.height()
-        end_col = current_rect.left() + current_rect.width()
-
-        print(f"检查范围: 行 {start_row}-{end_row-1}, 列 {start_col}-{end_col-1}")
-
-        # 统计各种格子类型的数量
-        empty_cells = 0
-        occupied_cells = 0
-        vertical_cells = 0
-        horizontal_cells = 0
-        main_cells = 0
-        sub_cells = 0
-
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                cell = self.model.get_cell(row, col)
-                if cell:
-                    if cell.is_occupied:
-                        occupied_cells += 1
-                        if cell.is_main_cell:
-                            main_cells += 1
-                        else:
-                            sub_cells += 1
-
-                        if cell.image:
-                            if cell.image.orientation == ImageOrientation.VERTICAL:
-                                vertical_cells += 1
-                            else:
-                                horizontal_cells += 1
-
-                            print(
-                                f"  格子({row}, {col}): 已占用, {cell.image.orientation.value}, "
-                                f"{'主格子' if cell.is_main_cell else '子格子'} - {cell.image.path.name}"
-                            )
-                            if not cell.is_main_cell:
-                                print(f"    主格子位置: {cell.main_position}")
-                        else:
-                            print(f"  格子({row}, {col}): 已占用但无图片信息")
-                    else:
-                        empty_cells += 1
-                        print(f"  格子({row}, {col}): 空闲")
+        start_col, start_row, width, height = current_rect.getRect()
+        # 静默扩展时，同一区域在模型未变化的情况下已确认无需扩展则直接返回
+        expand_key = (start_col, start_row, width, height, self.model.version)
+        if silent and expand_key == self._expanded_key:
+            return False
 
-        print(
-            f"格子统计: 总计{end_row-start_row}x{end_col-start_col}={occupied_cells+empty_cells}个格子"
+        # 调试输出只在开启 DEBUG 日志时格式化，避免热路径上的字符串拼接和 I/O；
+        # 移动、清空等内部静默调用默认不输出
+        debug = logger.isEnabledFor(logging.DEBUG) and (
+            not silent or EXPAND_DEBUG_VERBOSE
         )
-        print(
-            f"  空闲: {empty_cells}, 已占用: {occupied_cells} (主格子: {main_cells}, 子格子: {sub_cells})"
-        )
-        print(f"  竖屏格子: {vertical_cells}, 横屏格子: {horizontal_cells}")
 
-        # 获取选中区域内的所有竖屏图片
-        vertical_images = self.get_vertical_images_in_region(current_rect)
-        horizontal_images = self.get_horizontal_images_in_region(current_rect)
+        end_row = start_row + height
+        end_col = start_col + width
+
+        # 快速路径：只有跨越区域上边界或下边界的竖屏图片才需要扩展，
+        # 即首行或下边界外一行出现竖屏占位格子；都没有时无需扫描整个区域
+        if silent and not debug:
+            states = self.model.cell_states
+            rows = self.model.rows
+            crosses_top = (
+                0 <= start_row < rows
+                and CELL_VERTICAL_SUB in states[start_row][start_col:end_col]
+            )
+            crosses_bottom = (
+                0 <= end_row < rows
+                and CELL_VERTICAL_SUB in states[end_row][start_col:end_col]
+            )
+            if not crosses_top and not crosses_bottom:
+                self._expanded_key = expand_key
+                return False
+
+            # 需要扩展时直接遍历竖屏主格子索引求行范围的并集，
+            # 竖屏图片通常很少，无需完整扫描区域
+            span = config.VERTICAL_IMAGE_SPAN
+            new_top = start_row
+            new_bottom = end_row
+            for row, col in self.model.vertical_mains:
+                if start_col <= col < end_col and start_row - span < row < end_row:
+                    if row < new_top:
+                        new_top = row
+                    if row + span > new_bottom:
+                        new_bottom = row + span
+            # 确保不超出网格范围
+            new_top = max(0, new_top)
+            new_bottom = min(rows, new_bottom)
+            self._apply_expanded_rect(
+                QRect(start_col, new_top, width, new_bottom - new_top), silent
+            )
+            return True
 
-        print(f"唯一图片统计:")
-        print(f"  竖屏图片数量: {len(vertical_images)}")
-        for i, vimg in enumerate(vertical_images):
-            print(
-                f"    竖屏图片 {i+1}: 主格子({vimg['row']}, {vimg['col']}) - {vimg['image'].path.name}"
+        if debug:
+            logger.debug(
+                "=== 智能扩展调试信息 (%s) ===", "静默模式" if silent else "交互模式"
             )
-            print(
-                f"      占用行范围: {vimg['start_row']}-{vimg['end_row']-1} (需要{vimg['end_row']-vimg['start_row']}行)"
+            logger.debug(
+                "当前选中区域: 列%d-%d 行%d-%d 大小: %dx%d",
+                start_col,
+                end_col - 1,
+                start_row,
+                end_row - 1,
+                width,
+                height,
             )
-            print(f"      占用格子: {vimg['occupied_cells']}")
 
-        print(f"  横屏图片数量: {len(horizontal_images)}")
-        for i, himg in enumerate(horizontal_images):
-            print(
-                f"    横屏图片 {i+1}: 位置({himg['row']}, {himg['col']}) - {himg['image'].path.name}"
+        # 单次扫描获取竖屏/横屏图片和格子统计
+        scan = self._scan_region(current_rect)
+        vertical_images = scan.vertical_images
+        horizontal_images = scan.horizontal_images
+
+        if __debug__ and EXPAND_DEBUG_VERBOSE and debug:
+            # 逐格输出区域内格子状态（仅调试时开启）
+            grid = self.model.grid
+            for row, row_cells in enumerate(grid[start_row:end_row], start_row):
+                for col, cell in enumerate(row_cells[start_col:end_col], start_col):
+                    if not cell.is_occupied:
+                        logger.debug("  格子(%d, %d): 空闲", row, col)
+                    elif cell.image:
+                        logger.debug(
+                            "  格子(%d, %d): 已占用, %s, %s - %s",
+                            row,
+                            col,
+                            cell.image.orientation.value,
+                            "主格子" if cell.is_main_cell else "子格子",
+                            cell.image.path.name,
+                        )
+                        if not cell.is_main_cell:
+                            logger.debug("    主格子位置: %s", cell.main_position)
+                    else:
+                        logger.debug("  格子(%d, %d): 已占用但无图片信息", row, col)
+
+        if debug:
+            # 统计和图片列表拼成一条日志输出，避免逐行写日志
+            lines = [
+                f"格子统计: 总计{scan.total}个格子, "
+                f"空闲: {scan.total - scan.occupied}, 已占用: {scan.occupied}",
+                f"唯一图片统计: 竖屏{len(vertical_images)}个, "
+                f"横屏{len(horizontal_images)}个",
+            ]
+            lines.extend(
+                f"  竖屏图片: 主格子({vimg.row}, {vimg.col}) "
+                f"从行{vimg.start_row}起占用{vimg.height}行 - {vimg.image.path.name}"
+                for vimg in vertical_images
+            )
+            lines.extend(
+                f"  横屏图片: 位置({himg.row}, {himg.col}) - {himg.image.path.name}"
+                for himg in horizontal_images
             )
+            logger.debug("\n".join(lines))
 
         if not vertical_images:
-            print("没有找到竖屏图片，无需扩展")
+            self._expanded_key = expand_key
+            if debug:
+                logger.debug("没有找到竖屏图片，无需扩展")
             if not silent:
-                QMessageBox.information(self, "提示", "选中区域内没有竖屏图片")
-            print("===================\n")
+                self._show_message(
+                    QMessageBox.Information, "提示", "选中区域内没有竖屏图片"
+                )
             return False
 
-        # 计算需要扩展的边界
-        new_top = current_rect.top()
-        new_bottom = current_rect.bottom()
-        new_left = current_rect.left()
-        new_right = current_rect.right()
-
-        print(
-            f"原始边界: top={new_top}, bottom={new_bottom}, left={new_left}, right={new_right}"
-        )
-
-        expansion_needed = False
-        expansion_details = []
-
-        for i, vimg in enumerate(vertical_images):
-            img_top = vimg["start_row"]
-            img_bottom = vimg["end_row"]
-
-            print(f"分析竖屏图片 {i+1} ({vimg['image'].path.name}):")
-            print(f"  图片需要占用行: {img_top}-{img_bottom-1}")
-            print(f"  当前选中区域行: {new_top}-{new_bottom-1}")
-
-            # 检查是否需要扩展
-            need_expand_top = img_top < new_top
-            need_expand_bottom = img_bottom > new_bottom
-
-            if need_expand_top or need_expand_bottom:
-                expansion_needed = True
-                old_top, old_bottom = new_top, new_bottom
-
-                if need_expand_top:
-                    new_top = min(new_top, img_top)
-                    expansion_details.append(f"向上扩展到行{img_top}")
-                    print(f"  需要向上扩展: 从行{old_top}扩展到行{img_top}")
-
-                if need_expand_bottom:
-                    new_bottom = max(new_bottom, img_bottom)
-                    expansion_details.append(f"向下扩展到行{img_bottom-1}")
-                    print(f"  需要向下扩展: 从行{old_bottom-1}扩展到行{img_bottom-1}")
+        # 计算需要扩展的边界：取区域与所有竖屏图片行范围的并集（结束行不包含）
+        new_top = scan.covered_top
+        new_bottom = scan.covered_bottom
 
-                print(f"  扩展后行范围: {new_top}-{new_bottom-1}")
-            else:
-                print(f"  该竖屏图片已完整包含在选中区域内")
-
-        if not expansion_needed:
-            print("所有竖屏图片都已完整包含在选中区域内，无需扩展")
+        if new_top >= start_row and new_bottom <= end_row:
+            self._expanded_key = expand_key
+            if debug:
+                logger.debug("所有竖屏图片都已完整包含在选中区域内，无需扩展")
             if not silent:
-                QMessageBox.information(
-                    self, "提示", "选中区域已包含所有完整的竖屏图片"
+                self._show_message(
+                    QMessageBox.Information, "提示", "选中区域已包含所有完整的竖屏图片"
                 )
-            print("===================\n")
             return False
 
         # 确保不超出网格范围
-        original_new_top, original_new_bottom = new_top, new_bottom
         new_top = max(0, new_top)
         new_bottom = min(self.model.rows, new_bottom)
 
-        if original_new_top != new_top or original_new_bottom != new_bottom:
-            print(
-                f"边界调整: 原始({original_new_top}-{original_new_bottom-1}) -> 最终({new_top}-{new_bottom-1})"
-            )
-
-        print(
-            f"最终边界: top={new_top}, bottom={new_bottom}, left={new_left}, right={new_right}"
-        )
-
         # 创建新的矩形 - 修复：保持原始的左右边界，只扩展上下
-        new_width = current_rect.width()  # 保持原始宽度
-        new_height = new_bottom - new_top  # 计算新高度
-        new_rect = QRect(current_rect.left(), new_top, new_width, new_height)
-
-        print("扩展结果:")
-        print(f"  原始区域大小: {current_rect.width()}列x{current_rect.height()}行")
-        print(f"  扩展后区域大小: {new_rect.width()}列x{new_rect.height()}行")
-        print(f"  扩展详情: {'; '.join(expansion_details)}")
-
-        # 计算扩展后新增的格子数
-        original_cells = current_rect.width() * current_rect.height()
-        new_cells = new_rect.width() * new_rect.height()
-        added_cells = new_cells - original_cells
-        print(f"  新增格子数: {added_cells} (原{original_cells} -> 新{new_cells})")
-
-        # 更新显示
-        self._update_spinboxes_from_rect(new_rect)
-        self.grid_preview.set_selected_area(new_rect)
-        self._update_status()
+        new_height = new_bottom - new_top  # 计算新高度，宽度保持不变
+        new_rect = QRect(start_col, new_top, width, new_height)
+
+        # 计算扩展后新增的格子数（宽度不变，只有新增的行）
+        added_cells = width * (new_height - height)
+
+        if debug:
+            # 扩展详情只在输出调试信息时格式化
+            expansion_details = []
+            if new_top < start_row:
+                expansion_details.append(f"向上扩展到行{new_top}")
+            if new_bottom > end_row:
+                expansion_details.append(f"向下扩展到行{new_bottom-1}")
+            logger.debug(
+                "扩展结果: %d列x%d行 -> %d列x%d行, 新增格子数: %d, 扩展详情: %s",
+                width,
+                height,
+                width,
+                new_height,
+                added_cells,
+                "; ".join(expansion_details),
+            )
 
-        print("===================\n")
+        self._apply_expanded_rect(new_rect, silent)
 
         if not silent:
-            QMessageBox.information(
-                self,
+            self._show_message(
+                QMessageBox.Information,
                 "扩展完成",
                 f"已扩展区域以包含 {len(vertical_images)} 个完整的竖屏图片\n"
-                f"区域大小: {current_rect.width()}列x{current_rect.height()}行 -> {new_rect.width()}列x{new_rect.height()}行\n"
+                f"区域大小: {width}列x{height}行 -> {width}列x{new_height}行\n"
                 f"新增格子: {added_cells} 个",
             )
 
         return True
 
+    def _apply_expanded_rect(self, new_rect: QRect, silent: bool):
+        """将扩展后的区域写回数值框和预览"""
+        # 静默调用方（移动、清空等）随后还会修改模型，状态信息延迟刷新以合并为一次
+        self._update_spinboxes_from_rect(new_rect)
+        self.grid_preview.set_selected_area(new_rect)
+        if silent:
+            self._schedule_status_update()
+        else:
+            self._update_status()
+
+    @Slot()
     def _clear_region(self):
         """清空指定区域"""
-        current_rect = self.grid_preview.selected_rect
-        if current_rect.isNull():
+        if not self.grid_preview.has_selection:
             return
 
         # 在清空之前先自动扩展选择区域以包含完整的竖屏图片
         self._auto_expand_for_vertical_images(silent=True)
 
-        # 重新获取扩展后的区域
+        # 扩展后的区域已直接写回预览部件，这里读取的是 Python 属性
         current_rect = self.grid_preview.selected_rect
+        start_col, start_row, width, height = current_rect.getRect()
+        end_row = start_row + height
+        end_col = start_col + width
 
-        # 显示确认对话框
-        reply = QMessageBox.question(
-            self,
-            "确认清空",
-            f"确定要清空区域 ({current_rect.top()},{current_rect.left()}) - ({current_rect.top() + current_rect.height() - 1},{current_rect.left() + current_rect.width() - 1}) 吗？",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No,
-        )
+        # 区域内没有图片时无需确认，直接返回
+        scan = self._scan_region(current_rect)
+        if not scan.occupied:
+            return
+        image_count = len(scan.vertical_images) + len(scan.horizontal_images)
+        last_row = end_row - 1
+        last_col = end_col - 1
 
-        if reply == QMessageBox.Yes:
-            # 清除该区域内的所有图片
-            start_row = current_rect.top()
-            start_col = current_rect.left()
-            end_row = current_rect.top() + current_rect.height()
-            end_col = current_rect.left() + current_rect.width()
-
-            for row in range(start_row, end_row):
-                for col in range(start_col, end_col):
-                    self.model.remove_image(row, col)
-
-            # 更新显示
-            self.update_preview()
-            if self.parent():
-                # 更新主窗口显示
-                self.parent().grid_widget.refresh_display()
-                self.parent().image_list_widget.update_lists()
-                self.parent().set_modified(True)  # 标记主窗口为已修改
-            QMessageBox.information(self, "成功", "区域已清空")
+        # 只有较大的区域才显示确认对话框
+        if width * height > CLEAR_CONFIRM_MIN_CELLS:
+            reply = QMessageBox.question(
+                self,
+                "确认清空",
+                f"确定要清空区域 ({start_row},{start_col}) - ({last_row},{last_col}) "
+                f"内的 {image_count} 张图片吗？",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if reply != QMessageBox.Yes:
+                return
+
+        # 清除该区域内的所有图片（模型一次完成批量清空）
+        self.model.begin_bulk()
+        try:
+            removed = self.model.clear_region(start_row, start_col, end_row, end_col)
+        finally:
+            dirty_region = self.model.end_bulk()
+
+        # 更新显示：预览和主窗口合并为一次延迟刷新，只刷新变化的格子范围
+        if dirty_region is not None:
+            self._post_refresh(dirty_region)
+        self._update_status()
+        # 清空结果用状态栏提示，不再弹出需要点击的模态对话框
+        message = f"区域已清空，移除了 {len(removed)} 张图片"
+        if self._main_window is not None:
+            self._main_window.status_bar.showMessage(message, CLEAR_MESSAGE_TIMEOUT_MS)
+        else:
+            self._show_message(QMessageBox.Information, "成功", message)
@@ -5,6 +5,7 @@
 import json
 import os
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
@@ -12,6 +13,60 @@ import config
 
 from models import PuzzleModel, ImageInfo, ImageOrientation
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
+# 同一目录下检查存在性的图片超过该数量时才列举整个目录，
+# 避免只引用少量图片时列举包含大量文件的目录
+_DIRECTORY_SCAN_MIN_LOOKUPS = 32
+
+# 方向取值到枚举的映射，反序列化时直接查表
+_ORIENTATIONS = {orientation.value: orientation for orientation in ImageOrientation}
+
+# JSON 编解码实现在导入时确定一次，调用时不再判断
+if orjson is not None:
+    _loads = orjson.loads
+    _ORJSON_OPTIONS = {True: orjson.OPT_INDENT_2, False: 0}
+
+    def _dumps(data: Dict[str, Any], pretty: bool = True) -> bytes:
+        """序列化为UTF-8 JSON字节串，pretty 为 True 时缩进2格，否则输出紧凑格式"""
+        return orjson.dumps(data, option=_ORJSON_OPTIONS[pretty])
+
+else:
+    # json.loads 可直接解析UTF-8字节串
+    _loads = json.loads
+    # 预先创建编码器，避免 json.dumps 每次按参数重新构造
+    _JSON_ENCODERS = {
+        True: json.JSONEncoder(indent=2, ensure_ascii=False),
+        False: json.JSONEncoder(separators=(",", ":"), ensure_ascii=False),
+    }
+
+    def _dumps(data: Dict[str, Any], pretty: bool = True) -> bytes:
+        """序列化为UTF-8 JSON字节串，pretty 为 True 时缩进2格，否则输出紧凑格式"""
+        return _JSON_ENCODERS[pretty].encode(data).encode("utf-8")
+
+
+def _write_atomic(file_path: Path, data: bytes):
+    """先完整写入临时文件并刷新到磁盘，再原子替换目标文件
+
+    保存中途出错或崩溃时不会留下只写了一半的状态文件
+    """
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class StateManager:
     """状态管理器"""
@@ -20,11 +75,18 @@ class StateManager:
         # 确保数据目录存在
         self.data_dir = Path(config.DATA_DIR)
         self.data_dir.mkdir(exist_ok=True)
+        # 上次保存的 (模型状态签名, 是否缩进, 时间戳, 编码后的内容)，模型未变化时直接复用
+        self._last_saved = None
+        # 状态文件基本信息缓存：路径 -> ((修改时间, 文件大小), 信息)，文件未变化时无需重新解析
+        self._state_info_cache: Dict[str, tuple] = {}
 
     def save_state(
         self, model: PuzzleModel, custom_filename: Optional[str] = None
     ) -> str:
-        """保存当前状态到JSON文件"""
+        """保存当前状态到JSON文件
+
+        用户指定文件名时输出缩进格式便于阅读，自动命名的存档输出紧凑格式
+        """
         # 生成文件名
         if custom_filename:
             filename = custom_filename
@@ -35,11 +97,73 @@ class StateManager:
             filename = f"{timestamp}{config.STATE_FILE_EXTENSION}"
 
         file_path = self.data_dir / filename
+        pretty = bool(custom_filename)
+
+        # 模型与上次保存时相同则复用已编码的内容，只替换其中的时间戳
+        saved_at = datetime.now().isoformat()
+        signature = self._state_signature(model)
+        last_saved = self._last_saved
+        if last_saved is not None and last_saved[:2] == (signature, pretty):
+            last_saved_at, data = last_saved[2:]
+            data = data.replace(last_saved_at.encode(), saved_at.encode(), 1)
+        else:
+            data = _dumps(self._build_state_data(model, saved_at), pretty)
+
+        # 写入文件
+        _write_atomic(file_path, data)
+        self._last_saved = (signature, pretty, saved_at, data)
+
+        # 刚保存的文件信息已知，直接写入缓存，之后查询无需再解析文件
+        self._cache_state_info(
+            str(file_path),
+            self._make_state_info(
+                str(file_path),
+                saved_at,
+                model.rows,
+                model.cols,
+                len(model.unused_images),
+                len(model.used_images),
+            ),
+        )
+
+        return str(file_path)
+
+    @staticmethod
+    def _state_signature(model: PuzzleModel) -> tuple:
+        """保存内容所依赖的模型状态，签名相同时保存结果也相同"""
+        return (
+            model,
+            model.version,
+            model.rows,
+            model.cols,
+            model.image_directory,
+            tuple(model.unused_images),
+            tuple(model.used_images),
+        )
+
+    def _build_state_data(self, model: PuzzleModel, timestamp: str) -> Dict[str, Any]:
+        """构建要保存的状态数据"""
+        # 图片目录前缀只计算一次，序列化时用字符串前缀判断代替 Path.relative_to
+        directory_prefix = None
+        if model.image_directory:
+            directory_prefix = str(model.image_directory)
+            if not directory_prefix.endswith(os.sep):
+                directory_prefix += os.sep
+
+        # 每张图片只序列化一次，网格布局中复用列表中已生成的结果
+        serialized_images: Dict[int, Dict[str, Any]] = {}
+
+        def serialize(image_info: ImageInfo) -> Dict[str, Any]:
+            image_data = serialized_images.get(id(image_info))
+            if image_data is None:
+                image_data = self._serialize_image(image_info, directory_prefix)
+                serialized_images[id(image_info)] = image_data
+            return image_data
 
         # 构建状态数据
         state_data = {
-            "version": "1.0",
-            "timestamp": datetime.now().isoformat(),
+            "version": config.STATE_FILE_VERSION,
+            "timestamp": timestamp,
             "image_directory": (
                 str(model.image_directory) if model.image_directory else None
             ),
@@ -52,48 +176,33 @@ class StateManager:
                 "output_height": config.GRID_OUTPUT_HEIGHT,
             },
             "images": {
-                "unused": [
-                    self._serialize_image(img, model.image_directory)
-                    for img in model.unused_images
-                ],
-                "used": [
-                    self._serialize_image(img, model.image_directory)
-                    for img in model.used_images
-                ],
+                "unused": [serialize(img) for img in model.unused_images],
+                "used": [serialize(img) for img in model.used_images],
             },
-            "grid_layout": [],
         }
 
-        # 保存网格布局
-        for row in range(model.rows):
-            grid_row = []
-            for col in range(model.cols):
-                cell = model.get_cell(row, col)
-                if cell and cell.image and cell.is_main_cell:
-                    cell_data = {
-                        "row": row,
-                        "col": col,
-                        "image": self._serialize_image(
-                            cell.image, model.image_directory
-                        ),
-                        "is_main_cell": True,
-                    }
-                    grid_row.append(cell_data)
-                else:
-                    grid_row.append(None)
-            state_data["grid_layout"].append(grid_row)
-
-        # 写入文件
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(state_data, f, indent=2, ensure_ascii=False)
-
-        return str(file_path)
+        # 保存网格布局：稀疏格式，只保存图片主格子 [row, col, 图片]
+        # 图片保存为已使用图片列表中的序号，不再重复完整的图片信息
+        used_index = {id(img): index for index, img in enumerate(model.used_images)}
+        grid = model.grid
+        grid_layout = []
+        for row, col in model.iter_main_cells(0, 0, model.rows, model.cols):
+            image = grid[row][col].image
+            image_ref = used_index.get(id(image))
+            if image_ref is None:
+                # 不在已使用列表中的图片（理论上不会出现）仍保存完整信息
+                grid_layout.append([row, col, serialize(image)])
+            else:
+                grid_layout.append([row, col, image_ref])
+        state_data["grid_layout_sparse"] = grid_layout
+
+        return state_data
 
     def load_state(self, file_path: str) -> Optional[Dict[str, Any]]:
         """从JSON文件加载状态"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                state_data = json.load(f)
+            with open(file_path, "rb") as f:
+                state_data = _loads(f.read())
             return state_data
         except Exception as e:
             print(f"加载状态文件失败: {e}")
@@ -119,6 +228,31 @@ class StateManager:
             if image_directory:
                 model.image_directory = image_directory
 
+            # 图片目录字符串只转换一次，反序列化时直接拼接
+            directory_str = str(image_directory) if image_directory else None
+
+            # 按目录缓存文件名，每个目录只列举一次，代替逐个图片 stat；
+            # 目录被引用的次数较少时直接 stat，不列举整个目录
+            directory_names: Dict[Path, set] = {}
+            directory_lookups: Dict[Path, int] = {}
+
+            def exists(path: Path) -> bool:
+                parent = path.parent
+                names = directory_names.get(parent)
+                if names is None:
+                    lookups = directory_lookups.get(parent, 0) + 1
+                    directory_lookups[parent] = lookups
+                    if lookups <= _DIRECTORY_SCAN_MIN_LOOKUPS:
+                        return path.exists()
+                    try:
+                        with os.scandir(parent) as entries:
+                            names = {entry.name for entry in entries}
+                    except OSError:
+                        names = set()
+                    directory_names[parent] = names
+                # 未命中时再直接检查（如大小写不敏感的文件系统）
+                return path.name in names or path.exists()
+
             # 加载图片列表
             images_data = state_data.get("images", {})
 
@@ -128,39 +262,56 @@ class StateManager:
 
             # 加载未使用图片
             for img_data in images_data.get("unused", []):
-                image_info = self._deserialize_image(img_data, image_directory)
-                if image_info and image_info.path.exists():
+                image_info = self._deserialize_image(img_data, directory_str)
+                if image_info and exists(image_info.path):
                     model.unused_images.append(image_info)
 
-            # 加载已使用图片
+            # 加载已使用图片，used_refs 按文件中的序号记录（文件不存在的为None）
+            used_refs = []
             for img_data in images_data.get("used", []):
-                image_info = self._deserialize_image(img_data, image_directory)
-                if image_info and image_info.path.exists():
+                image_info = self._deserialize_image(img_data, directory_str)
+                if image_info and exists(image_info.path):
                     model.used_images.append(image_info)
+                else:
+                    image_info = None
+                used_refs.append(image_info)
+
+            # 按图片字段建立索引，恢复布局时成员判断无需线性查找列表
+            used_by_key = {self._image_key(img): img for img in model.used_images}
+            unused_by_key = {self._image_key(img): img for img in model.unused_images}
 
             # 恢复网格布局
-            grid_layout = state_data.get("grid_layout", [])
-            for row_idx, grid_row in enumerate(grid_layout):
-                if row_idx >= model.rows:
-                    break
-                for col_idx, cell_data in enumerate(grid_row):
-                    if col_idx >= model.cols or not cell_data:
-                        continue
-
-                    image_data = cell_data.get("image")
-                    if image_data:
-                        image_info = self._deserialize_image(
-                            image_data, image_directory
-                        )
-                        if image_info and image_info.path.exists():
-                            # 确保图片在已使用列表中
-                            if image_info not in model.used_images:
-                                model.used_images.append(image_info)
-                            if image_info in model.unused_images:
-                                model.unused_images.remove(image_info)
-
-                            # 放置图片
-                            model.place_image(row_idx, col_idx, image_info)
+            for row, col, image in self._iter_layout_cells(
+                state_data, model.rows, model.cols
+            ):
+                if isinstance(image, int):
+                    # 1.1 起的格式：引用已使用图片列表中的序号
+                    image_info = None
+                    if 0 <= image < len(used_refs):
+                        image_info = used_refs[image]
+                else:
+                    # 1.0 格式：格子中保存完整的图片信息
+                    image_info = None
+                    if image:
+                        image_info = self._deserialize_image(image, directory_str)
+                        if image_info and not exists(image_info.path):
+                            image_info = None
+
+                if image_info:
+                    # 确保图片在已使用列表中，网格中复用列表里的同一对象
+                    key = self._image_key(image_info)
+                    listed = used_by_key.get(key)
+                    if listed is None:
+                        model.used_images.append(image_info)
+                        used_by_key[key] = image_info
+                    else:
+                        image_info = listed
+                    unused = unused_by_key.pop(key, None)
+                    if unused is not None:
+                        model.unused_images.remove(unused)
+
+                    # 放置图片
+                    model.place_image(row, col, image_info)
 
             return True
 
@@ -168,21 +319,50 @@ class StateManager:
             print(f"应用状态到模型失败: {e}")
             return False
 
+    @staticmethod
+    def _iter_layout_cells(state_data: Dict[str, Any], rows: int, cols: int):
+        """遍历网格布局中位于网格范围内的图片主格子，生成 (row, col, 图片序号或完整图片信息)
+
+        兼容 1.2 的稀疏格式和之前按行列保存的完整布局
+        """
+        sparse_layout = state_data.get("grid_layout_sparse")
+        if sparse_layout is not None:
+            for row, col, image in sparse_layout:
+                if 0 <= row < rows and 0 <= col < cols:
+                    yield row, col, image
+            return
+
+        # 完整布局用 islice 直接截断到网格范围，循环内无需逐格判断越界
+        for row, grid_row in enumerate(islice(state_data.get("grid_layout", []), rows)):
+            for col, cell_data in enumerate(islice(grid_row, cols)):
+                if cell_data:
+                    image_ref = cell_data.get("image_ref")
+                    if image_ref is None:
+                        yield row, col, cell_data.get("image")
+                    else:
+                        yield row, col, image_ref
+
+    @staticmethod
+    def _image_key(image_info: ImageInfo) -> tuple:
+        """图片信息的索引键，与 ImageInfo 的相等比较使用相同字段"""
+        return (
+            image_info.path,
+            image_info.orientation,
+            image_info.width,
+            image_info.height,
+        )
+
     def _serialize_image(
-        self, image_info: ImageInfo, image_directory: Optional[Path] = None
+        self, image_info: ImageInfo, directory_prefix: Optional[str] = None
     ) -> Dict[str, Any]:
-        """序列化图片信息"""
-        # 如果提供了图片目录，则保存相对路径，否则保存绝对路径（向后兼容）
-        if image_directory:
-            try:
-                # 计算相对于图片目录的相对路径
-                relative_path = image_info.path.relative_to(image_directory)
-                path_str = str(relative_path)
-            except ValueError:
-                # 如果无法计算相对路径，则使用绝对路径
-                path_str = str(image_info.path)
-        else:
-            path_str = str(image_info.path)
+        """序列化图片信息
+
+        directory_prefix 为以路径分隔符结尾的图片目录，图片位于该目录下时保存相对路径，
+        否则保存绝对路径（向后兼容）
+        """
+        path_str = str(image_info.path)
+        if directory_prefix and path_str.startswith(directory_prefix):
+            path_str = path_str[len(directory_prefix) :]
 
         return {
             "path": path_str,
@@ -192,23 +372,27 @@ class StateManager:
         }
 
     def _deserialize_image(
-        self, image_data: Dict[str, Any], image_directory: Optional[Path] = None
+        self, image_data: Dict[str, Any], image_directory: Optional[str] = None
     ) -> Optional[ImageInfo]:
-        """反序列化图片信息"""
+        """反序列化图片信息，image_directory 为图片目录的字符串形式"""
         try:
             path_str = image_data["path"]
-            path = Path(path_str)
 
             # 如果路径不是绝对路径且提供了图片目录，则构建绝对路径
-            if not path.is_absolute() and image_directory:
-                path = image_directory / path
+            if image_directory and not os.path.isabs(path_str):
+                path_str = os.path.join(image_directory, path_str)
 
-            orientation = ImageOrientation(image_data["orientation"])
-            width = image_data["width"]
-            height = image_data["height"]
+            # 先查表，未知取值交给枚举构造以给出原有的错误信息
+            orientation_value = image_data["orientation"]
+            orientation = _ORIENTATIONS.get(orientation_value)
+            if orientation is None:
+                orientation = ImageOrientation(orientation_value)
 
             return ImageInfo(
-                path=path, orientation=orientation, width=width, height=height
+                path=Path(path_str),
+                orientation=orientation,
+                width=image_data["width"],
+                height=image_data["height"],
             )
         except Exception as e:
             print(f"反序列化图片信息失败: {e}")
@@ -219,33 +403,69 @@ class StateManager:
         if not self.data_dir.exists():
             return []
 
-        state_files = []
-        for file_path in self.data_dir.iterdir():
-            if file_path.suffix == config.STATE_FILE_EXTENSION:
-                state_files.append(str(file_path))
+        # scandir 一次遍历同时取得文件类型和修改时间，无需逐个文件再 stat
+        with os.scandir(self.data_dir) as entries:
+            state_files = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in entries
+                if entry.name.endswith(config.STATE_FILE_EXTENSION) and entry.is_file()
+            ]
 
         # 按修改时间排序（最新的在前）
-        state_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-        return state_files
+        state_files.sort(reverse=True)
+        return [path for _, path in state_files]
 
     def get_state_info(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """获取状态文件基本信息"""
+        """获取状态文件基本信息，文件未变化时直接返回缓存"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                state_data = json.load(f)
+            stat = os.stat(file_path)
+            cached = self._state_info_cache.get(str(file_path))
+            if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+                return dict(cached[1])
+
+            with open(file_path, "rb") as f:
+                state_data = _loads(f.read())
 
             grid_config = state_data.get("grid_config", {})
             images_data = state_data.get("images", {})
 
-            return {
-                "filename": Path(file_path).name,
-                "timestamp": state_data.get("timestamp", ""),
-                "grid_size": f"{grid_config.get('rows', 0)}x{grid_config.get('cols', 0)}",
-                "unused_count": len(images_data.get("unused", [])),
-                "used_count": len(images_data.get("used", [])),
-                "total_images": len(images_data.get("unused", []))
-                + len(images_data.get("used", [])),
-            }
+            info = self._make_state_info(
+                file_path,
+                state_data.get("timestamp", ""),
+                grid_config.get("rows", 0),
+                grid_config.get("cols", 0),
+                len(images_data.get("unused", [])),
+                len(images_data.get("used", [])),
+            )
+            self._cache_state_info(str(file_path), info)
+            return dict(info)
         except Exception as e:
             print(f"获取状态文件信息失败: {e}")
             return None
+
+    def _cache_state_info(self, file_path: str, info: Dict[str, Any]):
+        """按文件当前的修改时间和大小缓存状态文件信息"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        self._state_info_cache[file_path] = ((stat.st_mtime_ns, stat.st_size), info)
+
+    @staticmethod
+    def _make_state_info(
+        file_path: str,
+        timestamp: str,
+        rows: int,
+        cols: int,
+        unused_count: int,
+        used_count: int,
+    ) -> Dict[str, Any]:
+        """构建状态文件基本信息"""
+        return {
+            "filename": Path(file_path).name,
+            "timestamp": timestamp,
+            "grid_size": f"{rows}x{cols}",
+            "unused_count": unused_count,
+            "used_count": used_count,
+            "total_images": unused_count + used_count,
+        }